@@ -28,7 +28,7 @@ async def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await crud.users.get_user(session, user_id=token_data.sub)
+    user = await crud.users.get_cached_user(session, user_id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -0,0 +1,32 @@
+from fastapi import Request, Response, status
+
+from app.core.hashing import fingerprint
+
+# responses depend on the user: shared caches must not store them and
+# clients must revalidate before reusing them
+CACHE_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+def make_etag(*values) -> str:
+    return f'"{fingerprint(*values)}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Tell whether the If-None-Match header of the request matches the ETag.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # weak comparison, as required for If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, **CACHE_HEADERS},
+    )
@@ -1,5 +1,9 @@
 from fastapi import APIRouter, status
 
+from app.core.cache import get_cache_stats
+from app.core.security import get_password_hash_stats
+from app.db.session import get_pool_status
+
 router = APIRouter()
 
 
@@ -14,3 +18,42 @@ async def health_check() -> dict:
     Endpoint for health checks.
     """
     return {"status": "ok"}
+
+
+@router.get(
+    path="/health/db",
+    name="db_pool_status",
+    summary="Database connection pool statistics",
+    status_code=status.HTTP_200_OK,
+)
+async def db_pool_status() -> dict:
+    """
+    Endpoint for monitoring the database connection pool of this process.
+    """
+    return get_pool_status()
+
+
+@router.get(
+    path="/health/password-hashing",
+    name="password_hash_status",
+    summary="Password hashing thread pool statistics",
+    status_code=status.HTTP_200_OK,
+)
+async def password_hash_status() -> dict:
+    """
+    Endpoint for monitoring how long logins wait for password hashing.
+    """
+    return get_password_hash_stats()
+
+
+@router.get(
+    path="/health/cache",
+    name="cache_status",
+    summary="Cache hit and miss counters",
+    status_code=status.HTTP_200_OK,
+)
+async def cache_status() -> dict:
+    """
+    Endpoint for sizing the caches of this process from their hit ratio.
+    """
+    return get_cache_stats()
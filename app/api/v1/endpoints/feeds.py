@@ -1,10 +1,12 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.api.deps import get_current_user
+from app.api.etag import CACHE_HEADERS, etag_matches, make_etag, not_modified
 from app.crawler.worker import worker
 from app.db.session import get_async_session
 from app.models.users import User as DBUser
@@ -21,18 +23,33 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
 )
 async def get_feeds(
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
     current_user: DBUser = Depends(get_current_user),
 ) -> List[FeedSchema]:
     """
     Retrieve all feeds that the current user has subscribed to.
 
+    Responses carry an `ETag`: when it is sent back in `If-None-Match` and
+    the feeds did not change, 304 Not Modified is returned without a body.
+
     Returns:
-        A list of FeedSchema objects containing the url and title of the subscribed feeds.
+        A list of FeedSchema objects containing the url and title of the subscribed feeds,
+        along with the number of items not read yet.
     """
-    feeds_in_db = await crud.feeds.get_feed_by_user(session, user_id=current_user.id)
-    feeds = [FeedSchema.from_orm(feed) for feed in feeds_in_db]
-    return feeds
+    version = await crud.feeds.get_feeds_version(session, user_id=current_user.id)
+    etag = make_etag(current_user.id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    feeds_in_db = await crud.feeds.get_feeds_with_unread_count(
+        session, user_id=current_user.id
+    )
+    # rows come straight from the database: skip validation and encode as is
+    return ORJSONResponse(
+        [feed._asdict() for feed in feeds_in_db],
+        headers={"ETag": etag, **CACHE_HEADERS},
+    )
 
 
 @router.post(
@@ -104,14 +121,14 @@ async def get_feed_by_id(
         :param feed_id:
         :param session:
     """
-    db_feed = await crud.feeds.get_feed(session, feed_id)
-    if not db_feed:
+    feed = await crud.feeds.get_feed_cached(session, feed_id)
+    if not feed:
         raise HTTPException(
             status_code=404,
             detail="Feed does not exist in the system",
         )
 
-    return FeedSchema.from_orm(db_feed)
+    return feed
 
 
 @router.delete(
@@ -162,6 +179,9 @@ async def force_update_feed(
     """
     Enable auto-update and trigger a force update of the specified feed.
 
+    The circuit of a failing feed is closed, so it is fetched right away
+    instead of waiting for its next probe.
+
     Args:
         feed_id: The ID of the feed to be updated.
 
@@ -179,7 +199,7 @@ async def force_update_feed(
             detail="No feed found",
         )
 
-    if not feed.is_update_enabled:
+    if not feed.is_update_enabled or feed.circuit_open_until is not None:
         feed = await crud.feeds.enable_update(session, feed_id)
 
         worker.send_task(
@@ -188,6 +208,8 @@ async def force_update_feed(
                 "feed_id": feed.id,
                 "url": feed.url,
                 "modified_at": feed.modified_at,
+                "etag": feed.etag,
+                "content_hash": feed.content_hash,
             },
         )
 
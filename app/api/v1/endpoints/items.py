@@ -1,14 +1,27 @@
+import csv
+import io
 from datetime import datetime
-from typing import List
+from typing import AsyncIterator, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
 from app.api.deps import get_current_user
-from app.db.session import get_async_session
+from app.api.etag import CACHE_HEADERS, etag_matches, make_etag, not_modified
+from app.db.session import get_async_session, get_session
 from app.models.users import User as DBUser
-from app.schemas import ItemQueryParams, ItemSchema
+from app.schemas import (
+    ItemExportFormatEnum,
+    ItemExportQueryParams,
+    ItemQueryParams,
+    ItemSchema,
+    UpdateReadStatusResultSchema,
+    UpdateReadStatusSchema,
+)
 
 router = APIRouter()
 
@@ -21,6 +34,7 @@ router = APIRouter()
     status_code=status.HTTP_200_OK,
 )
 async def get_items(
+    request: Request,
     query_params: ItemQueryParams = Depends(),
     session: AsyncSession = Depends(get_async_session),
     current_user: DBUser = Depends(get_current_user),
@@ -28,23 +42,159 @@ async def get_items(
     """
     Get a list of all items from feeds subscribed by the current user.
 
+    Items are returned in pages of at most `limit` items. When more items
+    follow, the `X-Next-Cursor` response header holds the `cursor` to pass
+    for the next page.
+
+    Responses carry an `ETag`: when it is sent back in `If-None-Match` and
+    the page did not change, 304 Not Modified is returned without a body.
+
     Args:
         query: Optional query parameters to filter the items list.
 
     Returns:
         A list of ItemSchema objects containing information about each item.
+        :param request:
         :param query_params:
         :param current_user:
         :param session:
     """
+    version = await crud.items.get_items_version(
+        session, current_user.id, query_params
+    )
+    etag = make_etag(
+        current_user.id,
+        query_params.feed_id,
+        query_params.status,
+        query_params.order,
+        query_params.limit,
+        query_params.cursor,
+        *version,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    items = await crud.items.get_items(session, current_user.id, query_params)
+    try:
+        items, next_cursor = await crud.items.get_items(
+            session, current_user.id, query_params
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     if not items:
         raise HTTPException(
             status_code=404,
             detail="No item exist in the system",
         )
-    return [ItemSchema.from_orm(item) for item in items]
+    headers = {"ETag": etag, **CACHE_HEADERS}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    # rows come straight from the database: skip validation and encode as is
+    return ORJSONResponse([item._asdict() for item in items], headers=headers)
+
+
+async def _stream_items(
+    user_id: int, query_params: ItemExportQueryParams
+) -> AsyncIterator[List[Row]]:
+    # the rows are read while the response is sent, after the endpoint has
+    # returned, so the stream opens the session holding its server-side cursor
+    # itself instead of depending on the request-scoped one
+    async with get_session() as session:
+        async for rows in crud.items.stream_items(session, user_id, query_params):
+            yield rows
+
+
+async def _export_ndjson(chunks: AsyncIterator[List[Row]]) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        yield b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
+
+
+async def _export_csv(chunks: AsyncIterator[List[Row]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(ItemSchema.__fields__)
+    async for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get(
+    path="/export",
+    name="export_items",
+    summary="Export all items from feeds subscribed by the current user",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def export_items(
+    query_params: ItemExportQueryParams = Depends(),
+    current_user: DBUser = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Stream all items from feeds subscribed by the current user.
+
+    Items are streamed as newline delimited JSON, one item per line, or as
+    CSV with a header row. Items are read from the database in chunks, so
+    exports of any size use the same amount of memory.
+
+    Args:
+        query_params: Optional filters and the format of the export.
+
+    Returns:
+        A streamed file with the items.
+        :param query_params:
+        :param current_user:
+    """
+    chunks = _stream_items(current_user.id, query_params)
+    if query_params.format == ItemExportFormatEnum.csv:
+        content, media_type = _export_csv(chunks), "text/csv"
+    else:
+        content, media_type = _export_ndjson(chunks), "application/x-ndjson"
+
+    filename = f"items.{query_params.format.value}"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    path="/read-status",
+    name="update_items_read_status",
+    summary="Mark many items as read or unread",
+    response_model=UpdateReadStatusResultSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def update_items_read_status(
+    read_status: UpdateReadStatusSchema,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: DBUser = Depends(get_current_user),
+) -> UpdateReadStatusResultSchema:
+    """
+    Mark items from feeds subscribed by the current user as read or unread.
+
+    Args:
+        read_status: Which items to update: a list of item ids, all items of a
+            feed, and/or all items updated until a timestamp. Without any of
+            these, all items of all subscribed feeds are updated.
+
+    Returns:
+        The number of items whose read status changed.
+        :param read_status:
+        :param current_user:
+        :param session:
+    """
+    updated = await crud.read_status.update_items_read_status(
+        session,
+        current_user.id,
+        read_status.mark_as_read,
+        item_ids=read_status.item_ids,
+        feed_id=read_status.feed_id,
+        until=read_status.until,
+    )
+    return UpdateReadStatusResultSchema(updated=updated)
 
 
 @router.get(
@@ -68,14 +218,14 @@ async def get_item_by_id(
         :param item_id:
         :param session:
     """
-    item = await crud.items.get_item(session, item_id)
+    item = await crud.items.get_item_cached(session, item_id)
     if not item:
         raise HTTPException(
             status_code=404,
             detail="Item does not exist in the system",
         )
 
-    return ItemSchema.from_orm(item)
+    return item
 
 
 @router.post(
@@ -106,14 +256,16 @@ async def update_item(
         :param mark_as_read:
     """
 
-    item = await crud.items.get_item(session, item_id)
+    item = await crud.items.get_item_cached(session, item_id)
     if not item:
         raise HTTPException(
             status_code=404,
             detail="Item does not exist in the system",
         )
-    subscription = await crud.subscription.get_subscription_by_user_and_feed(session, item.feed_id, current_user.id)
-    if not subscription:
+    feed_ids = await crud.subscription.get_subscribed_feed_ids(
+        session, current_user.id
+    )
+    if item.feed_id not in feed_ids:
         raise HTTPException(
             status_code=404,
             detail=f"You dont have subscription for the feed {item.feed_id}",
@@ -123,4 +275,4 @@ async def update_item(
         session, item_id, current_user.id, mark_as_read
     )
 
-    return ItemSchema.from_orm(item)
+    return item
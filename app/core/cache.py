@@ -0,0 +1,243 @@
+import asyncio
+import functools
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Type
+
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+INVALIDATION_CHANNEL = "feedfuse:cache:invalidate"
+
+_MISSING = object()
+_caches: Dict[str, "TTLCache"] = {}
+_redis_caches: Dict[str, "RedisCache"] = {}
+_redis: Optional[aioredis.Redis] = None
+_listener: Optional[asyncio.Task] = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Return the Redis client of this process, or None without CACHE_REDIS_URL.
+    """
+    global _redis
+    if _redis is None and settings.CACHE_REDIS_URL:
+        _redis = aioredis.from_url(settings.CACHE_REDIS_URL)
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+    _redis = None
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries expire after a fixed time to live.
+
+    Every process keeps its own copy, so an invalidation is broadcast to the
+    other processes through Redis when CACHE_REDIS_URL is set; otherwise
+    stale entries of other processes live at most for the time to live.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = settings.CACHE_MAX_SIZE,
+        ttl: float = settings.CACHE_TTL_SECONDS,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        _caches[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def invalidate(self, key: Hashable) -> None:
+        """
+        Drop an entry in this process and in every other one.
+        """
+        self.discard(key)
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.publish(INVALIDATION_CHANNEL, json.dumps([self.name, key]))
+        except Exception as exc:
+            logging.warning("failed to broadcast cache invalidation: %s", str(exc))
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class RedisCache:
+    """
+    Cache of serialized values shared by every process through Redis.
+
+    Entries expire after a fixed time to live. Without CACHE_REDIS_URL the
+    cache is disabled: lookups always miss and nothing is stored. Redis
+    errors are logged and treated as misses, so the database stays the
+    source of truth.
+    """
+
+    def __init__(self, name: str, ttl: int = settings.CACHE_REDIS_TTL_SECONDS):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        _redis_caches[name] = self
+
+    def _key(self, key: Hashable) -> str:
+        return f"feedfuse:cache:{self.name}:{key}"
+
+    async def get(self, key: Hashable) -> Optional[bytes]:
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            value = await redis.get(self._key(key))
+        except Exception as exc:
+            logging.warning("failed to read %s cache: %s", self.name, str(exc))
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: Hashable, value: bytes) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(self._key(key), value, ex=self.ttl)
+        except Exception as exc:
+            logging.warning("failed to write %s cache: %s", self.name, str(exc))
+
+    async def invalidate(self, *keys: Hashable) -> None:
+        redis = get_redis()
+        if redis is None or not keys:
+            return
+        try:
+            await redis.delete(*(self._key(key) for key in keys))
+        except Exception as exc:
+            logging.warning("failed to invalidate %s cache: %s", self.name, str(exc))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": bool(settings.CACHE_REDIS_URL),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def read_through(cache: RedisCache, schema: Type[BaseModel]):
+    """
+    Wrap a crud lookup taking (session, id) to go through the cache.
+
+    The wrapped function returns the schema built from the ORM object, not
+    the object itself, as only the schema can be stored.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(session, key):
+            cached = await cache.get(key)
+            if cached is not None:
+                return schema.parse_raw(cached)
+            db_object = await func(session, key)
+            if db_object is None:
+                return None
+            value = schema.from_orm(db_object)
+            await cache.set(key, value.json())
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+async def _listen_for_invalidations() -> None:
+    pubsub = get_redis().pubsub()
+    await pubsub.subscribe(INVALIDATION_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            name, key = json.loads(message["data"])
+            if name in _caches:
+                _caches[name].discard(key)
+    finally:
+        await pubsub.close()
+
+
+async def start_cache_invalidation() -> None:
+    """
+    Listen to invalidations sent by other processes, if Redis is configured.
+    """
+    global _listener
+    if get_redis() is None or _listener is not None:
+        return
+    _listener = asyncio.create_task(_listen_for_invalidations())
+
+
+async def stop_cache_invalidation() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except (asyncio.CancelledError, Exception):
+            pass
+    _listener = None
+    await close_redis()
+
+
+def clear_caches() -> None:
+    for cache in _caches.values():
+        cache.clear()
+
+
+def get_cache_stats() -> dict:
+    """
+    Return the hit and miss counters of every cache of this process.
+    """
+    return {
+        name: cache.stats()
+        for name, cache in {**_caches, **_redis_caches}.items()
+    }
@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_WORKERS: int = 4
 
     POSTGRES_SERVER: str
     POSTGRES_USER: str
@@ -30,12 +32,61 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_SIZE: int = 10000
+    CACHE_REDIS_URL: Optional[RedisDsn] = None
+    CACHE_REDIS_TTL_SECONDS: int = 60 * 5
+
     CELERY_BROKER_URL: AmqpDsn
     CELERY_RESULT_BACKEND: RedisDsn
     WORKER_INTERVAL_SECONDS: int = 30
     WORKER_MAX_RETRIES: int = 3
     WORKER_RETRY_INTERVAL_SECONDS: int = 10
 
+    CRAWLER_SHARD_COUNT: int = 1
+    # comma separated shards consumed by a worker, all of them when empty
+    CRAWLER_WORKER_SHARDS: str = ""
+
+    FETCH_BATCH_SIZE: int = 100
+    FETCH_MAX_CONNECTIONS: int = 100
+    FETCH_MAX_CONNECTIONS_PER_HOST: int = 4
+    FETCH_DNS_CACHE_SECONDS: int = 300
+    FETCH_CONNECT_TIMEOUT_SECONDS: int = 10
+    FETCH_READ_TIMEOUT_SECONDS: int = 30
+    FETCH_MAX_DOCUMENT_BYTES: int = 32 * 1024 * 1024
+    FETCH_HOST_RATE_PER_SECOND: float = 1.0
+    FETCH_HOST_BURST: int = 4
+    FETCH_HOST_MAX_WAIT_SECONDS: int = 30
+    FETCH_THROTTLE_DEFAULT_SECONDS: int = 60
+    FETCH_THROTTLE_MAX_SECONDS: int = 60 * 60
+    FETCH_RESPECT_ROBOTS: bool = True
+    ROBOTS_CACHE_SECONDS: int = 60 * 60 * 24
+
+    FEED_MIN_INTERVAL_SECONDS: int = 60
+    FEED_MAX_INTERVAL_SECONDS: int = 60 * 60 * 24
+    FEED_INTERVAL_BACKOFF_FACTOR: float = 2.0
+    FEED_INTERVAL_SPEEDUP_FACTOR: float = 0.5
+    FEED_FETCH_LEASE_SECONDS: int = 60 * 5
+    FEED_CIRCUIT_BASE_SECONDS: int = 60
+    FEED_CIRCUIT_MAX_SECONDS: int = 60 * 60 * 24 * 7
+    FEED_CIRCUIT_BACKOFF_FACTOR: float = 2.0
+    FEED_STREAMING_PARSER: bool = False
+    FEED_PARSER_CHUNK_SIZE: int = 64 * 1024
+    FEED_MAX_ENTRIES: int = 500
+    FEED_WATERMARK_GUIDS: int = 20
+    FEED_RECONCILE_INTERVAL_SECONDS: int = 60 * 60 * 24
+
+    UNREAD_COUNT_RECONCILE_INTERVAL_SECONDS: int = 60 * 60
+
+    EXPORT_FETCH_SIZE: int = 1000
+
     FIRST_USER: EmailStr
     FIRST_USER_PASSWORD: str
 
@@ -0,0 +1,23 @@
+import hashlib
+
+
+def content_hash(content: bytes) -> str:
+    """
+    Return a short digest of a raw document, used to detect unchanged bodies.
+    """
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def fingerprint(*values) -> str:
+    """
+    Return a short digest over field values, used to detect unchanged rows.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for value in values:
+        if value is None:
+            hasher.update(b"\x00")
+            continue
+        data = str(value).encode()
+        # length prefixed, so ("ab", "c") and ("a", "bc") differ
+        hasher.update(b"\x01" + len(data).to_bytes(8, "big") + data)
+    return hasher.hexdigest()
@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(updated_at: datetime, item_id: int) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+    """
+    data = json.dumps([updated_at.isoformat(), item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(updated_at), int(item_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
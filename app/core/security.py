@@ -1,12 +1,28 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Tuple, Union
 
 from jose import jwt
+from passlib.context import CryptContext
 
 from app.core.config import settings
 
 ALGORITHM = "HS256"
 
+# hashes made with other schemes or fewer rounds are upgraded on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_stats_lock = threading.Lock()
+_password_stats = {"calls": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -20,3 +36,65 @@ def create_access_token(
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+def _get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _password_executor
+
+
+def _timed(submitted_at: float, func, *args):
+    wait = time.perf_counter() - submitted_at
+    with _password_stats_lock:
+        _password_stats["calls"] += 1
+        _password_stats["wait_seconds_total"] += wait
+        _password_stats["wait_seconds_max"] = max(
+            _password_stats["wait_seconds_max"], wait
+        )
+    return func(*args)
+
+
+async def _run_in_password_executor(func, *args):
+    # bcrypt takes hundreds of milliseconds of CPU on purpose: run it on a
+    # few dedicated threads so logins neither block the event loop nor
+    # take over the default executor
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_executor(), _timed, time.perf_counter(), func, *args
+    )
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_password_executor(pwd_context.hash, password)
+
+
+async def verify_password(
+    password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its hash.
+
+    Returns whether the password matches and, if the hash is deprecated,
+    a new hash of the password to store instead.
+    """
+    return await _run_in_password_executor(
+        pwd_context.verify_and_update, password, hashed_password
+    )
+
+
+def get_password_hash_stats() -> dict:
+    """
+    Return how long password hashing waited for a free thread in this process.
+    """
+    with _password_stats_lock:
+        stats = dict(_password_stats)
+    stats["max_workers"] = settings.PASSWORD_HASH_MAX_WORKERS
+    stats["wait_seconds_avg"] = (
+        stats["wait_seconds_total"] / stats["calls"] if stats["calls"] else 0.0
+    )
+    return stats
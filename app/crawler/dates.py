@@ -0,0 +1,119 @@
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional, Sequence
+
+DATE_CACHE_SIZE = 4096
+
+MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun")
+        + ("jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+# zone names of RFC 822 and a few common ones, in hours from UTC; other names,
+# military zones included, are taken as UTC as RFC 2822 recommends
+ZONES = {
+    "est": -5,
+    "edt": -4,
+    "cst": -6,
+    "cdt": -5,
+    "mst": -7,
+    "mdt": -6,
+    "pst": -8,
+    "pdt": -7,
+    "bst": 1,
+    "cet": 1,
+    "cest": 2,
+    "eet": 2,
+    "eest": 3,
+}
+
+# RFC 822 / 1123 / 2822 dates, e.g. "Mon, 01 May 2023 19:06:27 +0200", with
+# an optional weekday and seconds, two digit years and zone names or comments
+RFC822_DATE = re.compile(
+    r"""^\s*(?:[a-z]{2,9}\.?,?\s*)?
+    (\d{1,2})[\s-]+([a-z]{3,9})\.?[\s-]+(\d{2,4})
+    \s+(\d{1,2}):(\d{2})(?::(\d{2}))?(?:\.\d+)?
+    \s*(?:([+-])(\d{2}):?(\d{2})|([a-z]{1,5}))?
+    \s*(?:\(.*\))?\s*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+# ISO 8601 / RFC 3339 dates, e.g. "2023-05-01T19:06:27.123+02:00"
+ISO8601_DATE = re.compile(
+    r"""^\s*(\d{4})-(\d{2})-(\d{2})
+    (?:[t\s](\d{2}):(\d{2})(?::(\d{2})(?:[.,]\d+)?)?)?
+    \s*(?:(z)|([+-])(\d{2}):?(\d{2})?)?\s*$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def parse_feed_datetime(
+    value: Optional[str], parsed: Optional[Sequence[int]] = None
+) -> Optional[datetime]:
+    """
+    Return a feed timestamp as a naive datetime in UTC, or None if invalid.
+
+    The date already parsed by feedparser, a struct in UTC, is used when
+    given. Otherwise the string is parsed as an RFC 822 or ISO 8601 date,
+    each distinct string only once.
+    """
+    if parsed:
+        try:
+            return datetime(*parsed[:6])
+        except (TypeError, ValueError):
+            pass
+    if not value:
+        return None
+    return _parse(value)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse(value: str) -> Optional[datetime]:
+    match = RFC822_DATE.match(value)
+    if match:
+        day, month_name, year, hour, minute, second = match.group(1, 2, 3, 4, 5, 6)
+        month = MONTHS.get(month_name[:3].lower())
+        if month is None:
+            return None
+        year = int(year)
+        if year < 100:
+            year += 2000 if year < 50 else 1900
+        elif year < 1000:
+            year += 1900
+        date = (year, month, int(day), int(hour), int(minute), int(second or 0))
+        sign, offset_hours, offset_minutes, zone = match.group(7, 8, 9, 10)
+        if zone:
+            offset = timedelta(hours=ZONES.get(zone.lower(), 0))
+            return _to_utc(date, offset)
+        return _to_utc(date, _offset(sign, offset_hours, offset_minutes))
+
+    match = ISO8601_DATE.match(value)
+    if match:
+        year, month, day, hour, minute, second = match.group(1, 2, 3, 4, 5, 6)
+        date = (
+            int(year),
+            int(month),
+            int(day),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+        )
+        return _to_utc(date, _offset(*match.group(8, 9, 10)))
+    return None
+
+
+def _offset(sign: str, hours: str, minutes: str) -> timedelta:
+    if not sign:
+        return timedelta()
+    offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+    return -offset if sign == "-" else offset
+
+
+def _to_utc(date: tuple, offset: timedelta) -> Optional[datetime]:
+    try:
+        return datetime(*date) - offset
+    except (ValueError, OverflowError):
+        return None
@@ -0,0 +1,189 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.crawler.politeness import HostRateLimiter, HostThrottled, parse_retry_after
+
+USER_AGENT = "FeedFuse/0.1 (+https://github.com/opumm/feedfuse)"
+ACCEPT = (
+    "application/atom+xml, application/rss+xml, application/rdf+xml, "
+    "application/xml;q=0.9, text/xml;q=0.8, */*;q=0.1"
+)
+# statuses by which a publisher asks us to come back later
+THROTTLE_STATUSES = (429, 503)
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class DocumentTooLarge(Exception):
+    """
+    The document is larger than the fetcher accepts.
+    """
+
+
+class FeedResponse(BaseModel):
+    url: str
+    status: int
+    content: bytes = b""
+    headers: Dict[str, str] = {}
+    etag: Optional[str] = None
+    modified: Optional[str] = None
+
+
+class FeedFetcher:
+    """
+    Asynchronous HTTP client shared by every feed fetched in a worker process.
+
+    Connections are kept alive in a single pool, DNS lookups are cached and
+    the number of requests in flight is capped globally and per host, so one
+    slow publisher can not stall the others. Requests to a host are spaced
+    by a rate limiter shared with the other workers.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.FETCH_MAX_CONNECTIONS,
+        max_connections_per_host: int = settings.FETCH_MAX_CONNECTIONS_PER_HOST,
+        dns_cache_seconds: int = settings.FETCH_DNS_CACHE_SECONDS,
+        connect_timeout: float = settings.FETCH_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = settings.FETCH_READ_TIMEOUT_SECONDS,
+        max_document_bytes: int = settings.FETCH_MAX_DOCUMENT_BYTES,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.dns_cache_seconds = dns_cache_seconds
+        self.max_document_bytes = max_document_bytes
+        self.timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.limiter = HostRateLimiter()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_requests: Dict[str, int] = {}
+
+    async def start(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            ttl_dns_cache=self.dns_cache_seconds,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",
+                "Accept": ACCEPT,
+            },
+        )
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def fetch(
+        self, url: str, etag: Optional[str] = None, modified: Optional[str] = None
+    ) -> FeedResponse:
+        """
+        Download a feed with a conditional GET.
+
+        Raises HostThrottled if the host can not be fetched now, because of
+        the rate limit or because it answered 429 or 503. Raises
+        DocumentTooLarge if the body is larger than max_document_bytes, which
+        stops the download. Raises aiohttp.ClientError or asyncio.TimeoutError
+        if the publisher can not be reached and aiohttp.ClientResponseError on
+        other error statuses.
+        """
+        await self.start()
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+        host = urlsplit(url).hostname or ""
+        crawl_delay = None
+        if settings.FETCH_RESPECT_ROBOTS:
+            crawl_delay = await self.limiter.crawl_delay(self._session, url)
+        await self.limiter.acquire(host, crawl_delay)
+
+        # wait for the host first, so a busy host does not hold global slots
+        async with self._host_slot(host), self._semaphore:
+            async with self._session.get(url, headers=headers) as response:
+                if response.status in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    await self.limiter.block(host, retry_after)
+                    raise HostThrottled(host, retry_after)
+                response.raise_for_status()
+                content = b"" if response.status == 304 else await self._read(response)
+                return FeedResponse(
+                    url=str(response.url),
+                    status=response.status,
+                    content=content,
+                    # feedparser looks response headers up by lowercase name
+                    headers={k.lower(): v for k, v in response.headers.items()},
+                    etag=response.headers.get("ETag"),
+                    modified=response.headers.get("Last-Modified"),
+                )
+
+    @asynccontextmanager
+    async def _host_slot(self, host: str) -> AsyncIterator[None]:
+        """
+        Hold one of the max_connections_per_host request slots of the host.
+
+        The semaphore of a host is dropped once no request to it is pending,
+        so it is not kept for every host ever fetched by the worker.
+        """
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(
+                self.max_connections_per_host
+            )
+            self._host_requests[host] = 0
+        self._host_requests[host] += 1
+        try:
+            async with self._host_semaphores[host]:
+                yield
+        finally:
+            self._host_requests[host] -= 1
+            if not self._host_requests[host]:
+                del self._host_semaphores[host], self._host_requests[host]
+
+    async def _read(self, response: aiohttp.ClientResponse) -> bytes:
+        if (response.content_length or 0) > self.max_document_bytes:
+            raise DocumentTooLarge(f"{response.url} is {response.content_length} bytes")
+        chunks, size = [], 0
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_document_bytes:
+                raise DocumentTooLarge(f"{response.url} is over {size} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+_fetcher: Optional[FeedFetcher] = None
+
+
+def get_fetcher() -> FeedFetcher:
+    """
+    Return the fetcher shared by every task of this worker process.
+    """
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = FeedFetcher()
+    return _fetcher
+
+
+async def close_fetcher() -> None:
+    global _fetcher
+    if _fetcher is not None:
+        await _fetcher.close()
+    _fetcher = None
@@ -0,0 +1,68 @@
+import logging
+from typing import List
+
+from app.core.config import settings
+from app.crawler.dates import parse_feed_datetime
+from app.crawler.payloads import FeedEntry
+from app.crawler.utils import upsert_items_in_db
+from app.crawler.worker import run_async, worker
+from app.schemas.items import CreateItemSchema
+
+
+@worker.task(
+    bind=True, name="ingest_feed_items", max_retries=settings.WORKER_MAX_RETRIES
+)
+def ingest_feed_items(
+    self,
+    feed_id: int,
+    items: List[FeedEntry],
+    reconciled: bool = False,
+    validators: dict = None,
+):
+    """Entry Loader - Upsert all Entries of a Feed into the Database.
+
+    Steps:
+        - Build an item from every feed entry, skipping malformed entries.
+        - Insert new entries and update changed ones with a single
+          "INSERT ... ON CONFLICT (feed_id, guid) DO UPDATE" statement.
+        - Move the high-water mark of the feed past these entries, and mark
+          the feed reconciled if these are all of its entries.
+        - Store the ETag, Last-Modified and body hash of the fetched document,
+          now that its entries are in.
+        - Schedule the next fetch of the feed, sooner if new items arrived.
+
+    Retry: Yes, retry on failure or exception.
+
+    Back-off: Yes, waits for fixed time before retry.
+
+    Drop: Yes, immediately after max retries.
+
+    """
+    new_items = []
+    for item in items:
+        try:
+            new_items.append(
+                CreateItemSchema(
+                    title=item["title"],
+                    url=item["link"],
+                    guid=item["id"],
+                    description=item["summary"],
+                    feed_id=feed_id,
+                    published_at=parse_feed_datetime(
+                        item["published"], item.get("published_parsed")
+                    ),
+                )
+            )
+        except Exception as exc:
+            logging.warning(
+                "skipped malformed entry of feed %s: %s", feed_id, str(exc)
+            )
+
+    try:
+        return run_async(upsert_items_in_db)(
+            feed_id, new_items, reconciled, validators
+        )
+
+    except Exception as exc:
+        logging.error("failed to run ingest_feed_items task: %s", str(exc))
+        raise self.retry(exc=exc, countdown=settings.WORKER_RETRY_INTERVAL_SECONDS)
@@ -0,0 +1,34 @@
+from typing import Any, Iterable, List, Mapping, TypedDict
+
+# the fields of a parsed entry read by the entry loaders
+ENTRY_FIELDS = ("id", "title", "link", "summary", "published")
+
+
+class FeedEntry(TypedDict, total=False):
+    """
+    Feed entry sent to the entry loaders, instead of the whole parsed entry.
+
+    A field missing from the parsed entry is missing here too, so the loaders
+    skip malformed entries as before. The publication date parsed by
+    feedparser is kept as (year, month, day, hour, minute, second) in UTC.
+    """
+
+    id: str
+    title: str
+    link: str
+    summary: str
+    published: str
+    published_parsed: List[int]
+
+
+def compact_entry(entry: Mapping[str, Any]) -> FeedEntry:
+    compact = FeedEntry(
+        {field: entry[field] for field in ENTRY_FIELDS if field in entry}
+    )
+    if entry.get("published_parsed"):
+        compact["published_parsed"] = list(entry["published_parsed"][:6])
+    return compact
+
+
+def compact_entries(entries: Iterable[Mapping[str, Any]]) -> List[FeedEntry]:
+    return [compact_entry(entry) for entry in entries]
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from app.core.cache import TTLCache, get_redis
+from app.core.config import settings
+
+ROBOTS_AGENT = "FeedFuse"
+
+# Token bucket of a host, in Redis so every worker shares it. A token is
+# only taken when the caller is willing to wait for it; while the host is
+# blocked (it answered 429 or 503) no token is handed out at all.
+# Returns {reserved, seconds to wait}.
+TOKEN_BUCKET_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return {0, tostring(blocked / 1000)}
+end
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+end
+local reserved = 0
+if wait <= max_wait then
+    tokens = tokens - 1
+    reserved = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((burst + max_wait) / rate) + 1)
+return {reserved, tostring(wait)}
+"""
+
+
+class HostThrottled(Exception):
+    """
+    The host can not be fetched before retry_after seconds.
+    """
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"host {host} throttled for {retry_after:.0f} seconds")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    """
+    Return the delay of a Retry-After header, given in seconds or as a date.
+    """
+    delay = settings.FETCH_THROTTLE_DEFAULT_SECONDS
+    if value:
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                pass
+    return min(max(delay, 0), settings.FETCH_THROTTLE_MAX_SECONDS)
+
+
+def robots_url(url: str) -> str:
+    """
+    Return the URL of the robots.txt that applies to a URL.
+
+    robots.txt is per scheme, host and port, so the port is kept and the
+    credentials, if any, are dropped.
+    """
+    parts = urlsplit(url)
+    netloc = parts.netloc.rpartition("@")[2]
+    return f"{parts.scheme}://{netloc}/robots.txt"
+
+
+class HostRateLimiter:
+    """
+    Politeness limiter spacing the requests sent to every publisher host.
+
+    Each host gets a token bucket refilled at FETCH_HOST_RATE_PER_SECOND, or
+    slower if its robots.txt asks for a crawl delay. Buckets live in Redis
+    when CACHE_REDIS_URL is set, so all workers share them, and in this
+    process otherwise or while Redis is unreachable.
+    """
+
+    def __init__(
+        self,
+        rate: float = settings.FETCH_HOST_RATE_PER_SECOND,
+        burst: int = settings.FETCH_HOST_BURST,
+        max_wait: float = settings.FETCH_HOST_MAX_WAIT_SECONDS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._crawl_delays = TTLCache("robots", ttl=settings.ROBOTS_CACHE_SECONDS)
+
+    async def acquire(self, host: str, crawl_delay: Optional[float] = None) -> None:
+        """
+        Wait for the turn of a request to the host.
+
+        Raises HostThrottled instead of waiting longer than max_wait.
+        """
+        rate, burst = self.rate, self.burst
+        if crawl_delay:
+            rate, burst = min(rate, 1 / crawl_delay), 1
+        while True:
+            reserved, wait = await self._take(host, rate, burst)
+            if wait > self.max_wait:
+                raise HostThrottled(host, wait)
+            await asyncio.sleep(wait)
+            if reserved:
+                return
+
+    async def block(self, host: str, seconds: float) -> None:
+        """
+        Hold every request to the host back, after it asked us to slow down.
+        """
+        self._blocked_until[host] = time.monotonic() + seconds
+        redis = get_redis()
+        if redis is None or seconds <= 0:
+            return
+        try:
+            await redis.set(self._block_key(host), 1, px=int(seconds * 1000))
+        except Exception as exc:
+            logging.warning("failed to block host %s in redis: %s", host, str(exc))
+
+    async def _take(self, host: str, rate: float, burst: int) -> Tuple[bool, float]:
+        redis = get_redis()
+        if redis is not None:
+            try:
+                reserved, wait = await redis.eval(
+                    TOKEN_BUCKET_SCRIPT,
+                    2,
+                    self._bucket_key(host),
+                    self._block_key(host),
+                    rate,
+                    burst,
+                    self.max_wait,
+                )
+                return bool(reserved), float(wait)
+            except Exception as exc:
+                logging.warning("failed to rate limit in redis: %s", str(exc))
+        return self._take_locally(host, rate, burst)
+
+    def _take_locally(self, host: str, rate: float, burst: int) -> Tuple[bool, float]:
+        now = time.monotonic()
+        blocked = self._blocked_until.get(host, 0) - now
+        if blocked > 0:
+            return False, blocked
+
+        tokens, updated_at = self._buckets.get(host, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+        wait = (1 - tokens) / rate if tokens < 1 else 0.0
+        reserved = wait <= self.max_wait
+        if reserved:
+            tokens -= 1
+        self._buckets[host] = (tokens, now)
+        return reserved, wait
+
+    @staticmethod
+    def _bucket_key(host: str) -> str:
+        return f"feedfuse:host:{host}:bucket"
+
+    @staticmethod
+    def _block_key(host: str) -> str:
+        return f"feedfuse:host:{host}:blocked"
+
+    async def crawl_delay(self, session, url: str) -> Optional[float]:
+        """
+        Return the crawl delay asked by the robots.txt applying to the URL, cached.
+
+        A missing or unreadable robots.txt means no crawl delay.
+        """
+        robots = robots_url(url)
+        delay = self._crawl_delays.get(robots)
+        if delay is not None:
+            return delay or None
+
+        redis = get_redis()
+        key = f"feedfuse:robots:{robots}:crawl_delay"
+        if redis is not None:
+            try:
+                cached = await redis.get(key)
+                if cached is not None:
+                    delay = float(cached)
+                    self._crawl_delays.set(robots, delay)
+                    return delay or None
+            except Exception as exc:
+                logging.warning("failed to read crawl delay: %s", str(exc))
+
+        delay = await self._fetch_crawl_delay(session, robots)
+        self._crawl_delays.set(robots, delay)
+        if redis is not None:
+            try:
+                await redis.set(key, delay, ex=settings.ROBOTS_CACHE_SECONDS)
+            except Exception as exc:
+                logging.warning("failed to store crawl delay: %s", str(exc))
+        return delay or None
+
+    @staticmethod
+    async def _fetch_crawl_delay(session, url: str) -> float:
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                if response.status != 200:
+                    return 0.0
+                robots = RobotFileParser()
+                robots.parse((await response.text(errors="replace")).splitlines())
+        except Exception as exc:
+            logging.info("failed to read %s: %s", url, str(exc))
+            return 0.0
+        delay = robots.crawl_delay(ROBOTS_AGENT)
+        rate = robots.request_rate(ROBOTS_AGENT)
+        if rate and rate.requests:
+            delay = max(delay or 0, rate.seconds / rate.requests)
+        return float(delay or 0)
@@ -0,0 +1,38 @@
+import logging
+
+from app.core.config import settings
+from app.crawler.utils import reconcile_unread_counts_in_db
+from app.crawler.worker import run_async, worker
+
+
+@worker.task(bind=True, name="reconcile_unread_counts")
+def reconcile_unread_counts(self):
+    """Counter Repair - Recount Unread Items of Every Subscription.
+
+    Steps:
+        - Recount the unread items of every active subscription and overwrite
+          the stored counters that drifted.
+
+    Retry: No, it waits for the next scheduled run.
+
+    Back-off: No, as it does not have retry.
+
+    Drop: Yes, immediately after first fail.
+
+    """
+    try:
+        repaired = run_async(reconcile_unread_counts_in_db)()
+        if repaired:
+            logging.warning("repaired %s drifted unread counters", repaired)
+    except Exception as exc:
+        logging.error("failed to run reconcile_unread_counts task: %s", str(exc))
+
+
+@worker.on_after_finalize.connect
+def setup_periodic_tasks(sender, **kwargs):
+    interval = settings.UNREAD_COUNT_RECONCILE_INTERVAL_SECONDS
+    sender.add_periodic_task(
+        interval,
+        reconcile_unread_counts.s(),
+        name=f"reconcile unread counters every {interval} seconds",
+    )
@@ -1,10 +1,10 @@
 import logging
-
-from asgiref.sync import async_to_sync
+from collections import defaultdict
 
 from app.core.config import settings
-from app.crawler.utils import fetch_feed
-from app.crawler.worker import worker
+from app.crawler.sharding import shard_for_url
+from app.crawler.utils import claim_feeds
+from app.crawler.worker import run_async, worker
 
 
 @worker.task(bind=True, name="schedule_update_feed")
@@ -12,8 +12,13 @@ def schedule_update_feed(self):
     """Send Task to Update Feed.
 
     Steps:
-        - Get all feeds where update is enabled.
-        - Send task to "update_feed" for each of these feeds.
+        - Claim a chunk of enabled feeds whose next fetch is due and whose
+          circuit is not open, reading only the columns needed to fetch them,
+          and push their next fetch back by the fetch lease.
+        - Split the chunk by shard of the feed hosts and send task to
+          "update_feeds" with each part, routed to the queue of its shard,
+          over a producer shared by every chunk of this run.
+        - Repeat until no due feed is left.
 
     Retry: No, it waits for the next scheduled run.
 
@@ -22,19 +27,25 @@ def schedule_update_feed(self):
     Drop: Yes, immediately after first fail.
 
     """
+    batch_size = settings.FETCH_BATCH_SIZE
+    scheduled = 0
     try:
-        feeds = async_to_sync(fetch_feed)()
-        for feed in feeds:
-            worker.send_task(
-                "update_feed",
-                kwargs={
-                    "feed_id": feed.id,
-                    "url": feed.url,
-                    "modified_at": feed.modified_at,
-                },
-            )
+        with worker.producer_or_acquire() as producer:
+            while True:
+                feeds = run_async(claim_feeds)(batch_size)
+                shards = defaultdict(list)
+                for feed in feeds:
+                    shards[shard_for_url(feed["url"])].append(feed)
+                for shard_feeds in shards.values():
+                    worker.send_task(
+                        "update_feeds", args=[shard_feeds], producer=producer
+                    )
+                scheduled += len(feeds)
+                if len(feeds) < batch_size:
+                    break
     except Exception as exc:
         logging.error("failed to run schedule_update_feed task: %s", str(exc))
+    logging.info("scheduled %s feed updates", scheduled)
 
 
 @worker.on_after_finalize.connect
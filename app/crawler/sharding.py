@@ -0,0 +1,66 @@
+import hashlib
+from typing import List
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+SHARD_QUEUE_PREFIX = "crawler.shard"
+# tasks that talk to the publisher of a feed, routed to the shard of its host
+SHARDED_TASKS = ("update_feed", "update_feeds")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Map a 64 bit key to one of buckets with Jump Consistent Hash.
+
+    Going from n to n + 1 buckets only moves 1 / (n + 1) of the keys, all of
+    them to the new bucket.
+    """
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def shard_for_url(url: str, shard_count: int = None) -> int:
+    """
+    Return the shard of a feed, every feed of a host being in the same one.
+    """
+    shard_count = shard_count or settings.CRAWLER_SHARD_COUNT
+    host = (urlsplit(url).hostname or "").lower()
+    digest = hashlib.blake2b(host.encode(), digest_size=8).digest()
+    return jump_hash(int.from_bytes(digest, "big"), shard_count)
+
+
+def shard_queue(shard: int) -> str:
+    return f"{SHARD_QUEUE_PREFIX}.{shard}"
+
+
+def worker_shards() -> List[int]:
+    """
+    Return the shards consumed by this worker, all of them unless configured.
+    """
+    if not settings.CRAWLER_WORKER_SHARDS:
+        return list(range(settings.CRAWLER_SHARD_COUNT))
+    return [int(shard) for shard in settings.CRAWLER_WORKER_SHARDS.split(",")]
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router sending feed fetches to the queue of their shard.
+
+    "update_feeds" batches are built per shard, so the first feed of a batch
+    gives the shard of the whole batch.
+    """
+    if name not in SHARDED_TASKS:
+        return None
+    if name == "update_feed":
+        url = kwargs["url"] if kwargs and "url" in kwargs else args[1]
+    else:
+        feeds = args[0] if args else kwargs["feeds"]
+        if not feeds:
+            return None
+        url = feeds[0]["url"]
+    return {"queue": shard_queue(shard_for_url(url))}
@@ -0,0 +1,172 @@
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser, tostring
+
+from feedparser import FeedParserDict
+
+# not part of the public API of feedparser, which is pinned to 6.0.x for it
+from feedparser.sanitizer import _sanitize_html
+
+from app.core.config import settings
+from app.crawler.payloads import FeedEntry
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+RSS1 = "{http://purl.org/rss/1.0/}"
+RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+
+# RSS 2.0, RSS 1.0 and Atom
+ROOTS = {"rss", RDF + "RDF", ATOM + "feed"}
+CHANNELS = {"channel", RSS1 + "channel", ATOM + "feed"}
+ENTRIES = {"item", RSS1 + "item", ATOM + "entry"}
+
+# elements of a channel or an entry for each field, in order of preference,
+# named as feedparser names them
+FEED_FIELDS = {
+    "title": ("title", RSS1 + "title", ATOM + "title"),
+    "description": ("description", RSS1 + "description", ATOM + "subtitle"),
+    "updated": ("lastBuildDate", ATOM + "updated", DC + "date", "pubDate"),
+}
+ENTRY_FIELDS = {
+    "id": ("guid", ATOM + "id"),
+    "title": ("title", RSS1 + "title", ATOM + "title"),
+    "link": ("link", RSS1 + "link"),
+    "summary": (
+        "description",
+        RSS1 + "description",
+        ATOM + "summary",
+        CONTENT + "encoded",
+        ATOM + "content",
+    ),
+    "published": ("pubDate", DC + "date", ATOM + "published", ATOM + "updated"),
+}
+FEED_TAGS = {tag: field for field, tags in FEED_FIELDS.items() for tag in tags}
+
+
+class FeedDocumentError(ValueError):
+    """
+    The document is not well-formed XML or not an RSS or Atom feed.
+    """
+
+
+class StreamingFeedParser:
+    """
+    Incremental RSS 2.0, RSS 1.0 and Atom parser.
+
+    The document is fed to the XML parser chunk by chunk and every entry is
+    yielded, then dropped from the tree, as soon as its end tag is read, so
+    memory does not grow with the number of entries and the caller can stop
+    reading anytime. Channel fields are collected in feed along the way.
+    """
+
+    def __init__(self):
+        self.feed: Dict[str, str] = {}
+
+    def iter_entries(self, chunks: Iterable[bytes]) -> Iterator[FeedEntry]:
+        """
+        Yield the entries of the document, normalized like feedparser does.
+
+        Raises FeedDocumentError if the document is not a feed.
+        """
+        parser = XMLPullParser(events=("start", "end"))
+        parents: List[Element] = []
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+                for event, element in parser.read_events():
+                    if event == "start":
+                        if not parents and element.tag not in ROOTS:
+                            raise FeedDocumentError(f"unknown root {element.tag}")
+                        parents.append(element)
+                        continue
+
+                    parents.pop()
+                    parent = parents[-1] if parents else None
+                    if element.tag in ENTRIES:
+                        yield self._entry(element)
+                        parent.remove(element)
+                    elif parent is not None and parent.tag in CHANNELS:
+                        self._feed_field(element)
+            parser.close()
+        except ParseError as exc:
+            raise FeedDocumentError(str(exc)) from exc
+
+    def _feed_field(self, element: Element) -> None:
+        field = FEED_TAGS.get(element.tag)
+        if field and field not in self.feed:
+            self.feed[field] = _text(element)
+
+    @staticmethod
+    def _entry(element: Element) -> FeedEntry:
+        entry = FeedEntry()
+        for field, tags in ENTRY_FIELDS.items():
+            for tag in tags:
+                child = element.find(tag)
+                # an empty element is kept as "", like feedparser does
+                if child is not None:
+                    entry[field] = _text(child)
+                    break
+        if "id" not in entry and element.get(RDF + "about"):
+            entry["id"] = element.get(RDF + "about")
+        if "link" not in entry:
+            link = _atom_link(element)
+            if link:
+                entry["link"] = link
+        if "summary" in entry:
+            entry["summary"] = _sanitize_html(entry["summary"], "utf-8", "text/html")
+        return entry
+
+
+def _text(element: Element) -> str:
+    if len(element):
+        return _markup(element)
+    return element.text.strip() if element.text else ""
+
+
+def _markup(element: Element) -> str:
+    """
+    Return inline XHTML content as HTML, without its Atom wrapper div.
+    """
+    for descendant in element.iter():
+        if descendant is not element and "}" in descendant.tag:
+            descendant.tag = descendant.tag.split("}", 1)[1]
+    wrapped = len(element) == 1 and element[0].tag == "div"
+    if wrapped and not (element.text or "").strip():
+        element = element[0]
+    markup = (element.text or "") + "".join(
+        tostring(child, encoding="unicode") for child in element
+    )
+    return markup.strip()
+
+
+def _atom_link(element: Element) -> Optional[str]:
+    links = element.findall(ATOM + "link")
+    for link in links:
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return links[0].get("href") if links else None
+
+
+def _chunks(content: bytes, size: int) -> Iterator[memoryview]:
+    view = memoryview(content)
+    for start in range(0, len(view), size):
+        yield view[start : start + size]
+
+
+def parse_feed(
+    content: bytes,
+    max_entries: int = settings.FEED_MAX_ENTRIES,
+    chunk_size: int = settings.FEED_PARSER_CHUNK_SIZE,
+) -> FeedParserDict:
+    """
+    Parse the first max_entries entries of a feed, the way feedparser would.
+
+    The rest of the document is not read. Raises FeedDocumentError if the
+    document is not a feed.
+    """
+    parser = StreamingFeedParser()
+    entries = list(
+        islice(parser.iter_entries(_chunks(content, chunk_size)), max_entries)
+    )
+    return FeedParserDict(feed=FeedParserDict(parser.feed), entries=entries, bozo=False)
@@ -1,77 +1,169 @@
+import asyncio
 import logging
 
 import feedparser
-from asgiref.sync import async_to_sync
-from celery.exceptions import MaxRetriesExceededError
 from feedparser import FeedParserDict
 
+from app.core import hashing
 from app.core.config import settings
+from app.crawler.dates import parse_feed_datetime
+from app.crawler.fetcher import FeedResponse, get_fetcher
+from app.crawler.payloads import compact_entries
+from app.crawler.politeness import HostThrottled
+from app.crawler.streaming import FeedDocumentError, parse_feed
 from app.crawler.utils import (
-    parse_datetime_string,
-    pause_feed_update,
+    count_feed_fetch,
+    defer_feed,
+    get_feed_watermark,
+    record_feed_failure,
+    reschedule_feed,
     update_feed_in_db,
 )
-from app.crawler.worker import worker
+from app.crawler.watermark import new_entries
+from app.crawler.worker import run_async, worker
 from app.schemas.feeds import UpdateFeedSchema
 
 
-def get_feed_details(url, last_modified=None) -> FeedParserDict | None:
+async def get_feed_details(
+    response: FeedResponse, last_content_hash: str = None
+) -> FeedParserDict | None:
     """
-    Fetches a feed and returns the parsed result.
+    Parses a fetched feed and returns the result.
 
-    If the feed has not been modified since the last time it was fetched
-    (as indicated by the last_modified argument), the function returns None.
+    If the publisher answered 304 Not Modified, or sent exactly the same body
+    as the last time (as indicated by the last_content_hash argument), the
+    document is not parsed and the function returns None.
+
+    With FEED_STREAMING_PARSER, the document is parsed incrementally and
+    only its first FEED_MAX_ENTRIES entries are read; feedparser is used
+    when the document is not well-formed. Otherwise feedparser parses the
+    whole document and the entries are cut to FEED_MAX_ENTRIES.
     """
-    feed = feedparser.parse(url, modified=last_modified)
-    if feed.status == 304:  # Not Modified
+    if response.status == 304:  # Not Modified
         return None
 
-    if feed["bozo"]:
-        raise Exception(f"Failed to parse feed from URL {url}")
-    else:
-        return feed
-
+    body_hash = hashing.content_hash(response.content)
+    if body_hash == last_content_hash:
+        return None
 
-@worker.task(bind=True, name="update_feed", max_retries=settings.WORKER_MAX_RETRIES)
-def update_feed(self, feed_id: int, url: str, modified_at: str):
+    # parsing is CPU bound, keep the event loop free for the other downloads
+    feed = None
+    if settings.FEED_STREAMING_PARSER:
+        try:
+            feed = await asyncio.to_thread(parse_feed, response.content)
+        except FeedDocumentError as exc:
+            logging.info("falling back to feedparser for %s: %s", response.url, exc)
+    if feed is None:
+        feed = await asyncio.to_thread(
+            feedparser.parse, response.content, response_headers=response.headers
+        )
+        if feed["bozo"]:
+            raise Exception(f"Failed to parse feed from URL {response.url}")
+        feed["entries"] = feed["entries"][: settings.FEED_MAX_ENTRIES]
+
+    feed["status"] = response.status
+    feed["etag"] = response.etag
+    feed["modified"] = response.modified
+    feed["content_hash"] = body_hash
+    return feed
+
+
+async def process_feed(
+    feed_id: int,
+    url: str,
+    modified_at: str = None,
+    etag: str = None,
+    content_hash: str = None,
+) -> None:
+    try:
+        response = await get_fetcher().fetch(url, etag=etag, modified=modified_at)
+    except HostThrottled as exc:
+        # not a failure: come back when the host is willing to serve us
+        logging.info("deferred feed %s: %s", feed_id, str(exc))
+        await defer_feed(feed_id, exc.retry_after)
+        return
+    await count_feed_fetch(feed_id, not_modified=response.status == 304)
+    remote_feed = await get_feed_details(response, content_hash)
+    if not remote_feed:
+        await reschedule_feed(feed_id, has_new_items=False)
+    else:
+        new_feed = UpdateFeedSchema(
+            title=remote_feed.feed.title,
+            description=remote_feed.feed.description,
+            last_built_at=parse_feed_datetime(
+                remote_feed.feed.get("updated"), remote_feed.feed.get("updated_parsed")
+            ),
+        )
+        await update_feed_in_db(feed_id, new_feed)
+        # the fetch validators are only stored once the entries are ingested,
+        # otherwise a failed ingestion would be skipped as not modified later
+        validators = {
+            "modified_at": remote_feed.get("modified"),
+            "etag": remote_feed.get("etag"),
+            "content_hash": remote_feed.get("content_hash"),
+        }
+
+        watermark = await get_feed_watermark(feed_id)
+        reconcile = watermark is None or watermark.reconcile_due
+        entries = (
+            remote_feed.entries
+            if reconcile
+            else new_entries(remote_feed.entries, watermark)
+        )
+        if not entries and not reconcile:
+            # every entry of the document was ingested already
+            await update_feed_in_db(feed_id, UpdateFeedSchema(**validators))
+            await reschedule_feed(feed_id, has_new_items=False)
+            return
+        worker.send_task(
+            "ingest_feed_items",
+            args=[feed_id, compact_entries(entries), reconcile, validators],
+        )
+
+
+@worker.task(name="update_feed")
+def update_feed(
+    feed_id: int,
+    url: str,
+    modified_at: str,
+    etag: str = None,
+    content_hash: str = None,
+):
     """Feed Parser - Update Feed and Send Task to Update Feed Entry.
 
     Steps:
-        - Count if retry attemps. If max retry is reached:
-            - Drop message and stop the flow.
-            - Disable update for the feed.
-        - Get feed information from Database.
-        - Parse RSS Feed and items using the URL.
-        - Drop message if last built timestamp from RSS feed <= DB value.
-        - Update DB value for last built timestamp.
-        - Send task to "update_feed_entry" for each of these feed items.
-
-    Retry: Yes, retry on failure or exception.
-
-    Back-off: Yes, waits for fixed time before retry.
-
-    Drop: Yes, immediately after max retries or RSS feed not updated at source.
+        - Wait for the turn of the feed host, within its rate limit and
+          robots.txt crawl delay.
+        - Fetch RSS Feed conditionally with the stored ETag and Last-Modified.
+          If the host is throttled or answers 429/503, push the next fetch
+          back by the Retry-After delay and drop message.
+        - Count the fetch. If the source answered 304 or sent the same body as
+          last time, back off the polling interval of the feed, close its
+          circuit and drop message.
+        - Parse RSS Feed and at most FEED_MAX_ENTRIES items.
+        - Update DB values for title, description and last built timestamp.
+        - Keep the items past the high-water mark of the items already
+          ingested, or all of them when a full reconciliation is due. If no
+          item is left, store ETag, Last-Modified and body hash, back off
+          the polling interval and drop message.
+        - Send task to "ingest_feed_items" with these feed items, keeping
+          only the fields the loader reads, and the ETag, Last-Modified and
+          body hash to store once they are ingested.
+        - On failure, open the circuit of the feed and drop message.
+
+    Retry: No, a failed feed is probed again by the scheduler once its
+    circuit has been open for long enough.
+
+    Back-off: Yes, the circuit stays open exponentially longer with every
+    consecutive failure.
+
+    Drop: Yes, after a failure, RSS feed not updated at source or feed host
+    throttled.
 
     """
     try:
-        if self.request.retries >= settings.WORKER_MAX_RETRIES:
-            raise MaxRetriesExceededError
-
-        remote_feed = get_feed_details(url, modified_at)
-        if remote_feed:
-            new_feed = UpdateFeedSchema(
-                title=remote_feed.feed.title,
-                description=remote_feed.feed.description,
-                last_built_at=parse_datetime_string(remote_feed.feed.updated),
-                modified_at=remote_feed.modified,
-            )
-            async_to_sync(update_feed_in_db)(feed_id, new_feed)
-            for item in remote_feed.entries:
-                worker.send_task("update_feed_item", args=[feed_id, item])
-
-    except MaxRetriesExceededError:
-        async_to_sync(pause_feed_update)(feed_id)
+        run_async(process_feed)(feed_id, url, modified_at, etag, content_hash)
 
     except Exception as exc:
         logging.error("failed to run update_feed task: %s", str(exc))
-        raise self.retry(exc=exc, countdown=settings.WORKER_RETRY_INTERVAL_SECONDS)
+        run_async(record_feed_failure)(feed_id, exc)
@@ -1,22 +1,17 @@
 import logging
 
-from asgiref.sync import async_to_sync
-
 from app.core.config import settings
-from app.crawler.utils import (
-    create_item_in_db,
-    get_item_from_db,
-    parse_datetime_string,
-    update_item_in_db,
-)
-from app.crawler.worker import worker
+from app.crawler.dates import parse_feed_datetime
+from app.crawler.payloads import FeedEntry
+from app.crawler.utils import create_item_in_db, get_item_from_db, update_item_in_db
+from app.crawler.worker import run_async, worker
 from app.schemas.items import CreateItemSchema, UpdateItemSchema
 
 
 @worker.task(
     bind=True, name="update_feed_item", max_retries=settings.WORKER_MAX_RETRIES
 )
-def update_feed_item(self, feed_id: int, item: dict):
+def update_feed_item(self, feed_id: int, item: FeedEntry):
     """Entry Loader - Insert Feed Entry into the Database.
 
     Steps:
@@ -32,12 +27,12 @@ def update_feed_item(self, feed_id: int, item: dict):
 
     """
     try:
-        existing_item = async_to_sync(get_item_from_db)(item["id"])
+        existing_item = run_async(get_item_from_db)(feed_id, item["id"])
         if existing_item:
             updated_item = UpdateItemSchema(
                 title=item["title"], url=item["link"], description=item["summary"]
             )
-            async_to_sync(update_item_in_db)(existing_item.id, updated_item)
+            run_async(update_item_in_db)(existing_item.id, updated_item)
             return True
         else:
             new_item = CreateItemSchema(
@@ -46,9 +41,11 @@ def update_feed_item(self, feed_id: int, item: dict):
                 guid=item["id"],
                 description=item["summary"],
                 feed_id=feed_id,
-                published_at=parse_datetime_string(item["published"]),
+                published_at=parse_feed_datetime(
+                    item["published"], item.get("published_parsed")
+                ),
             )
-            async_to_sync(create_item_in_db)(new_item)
+            run_async(create_item_in_db)(new_item)
             return True
 
     except Exception as exc:
@@ -0,0 +1,40 @@
+import asyncio
+import logging
+from typing import List
+
+from app.crawler.update_feed.tasks import process_feed
+from app.crawler.utils import record_feed_failure
+from app.crawler.worker import run_async, worker
+
+
+async def process_feeds(feeds: List[dict]) -> list:
+    return await asyncio.gather(
+        *(process_feed(**feed) for feed in feeds), return_exceptions=True
+    )
+
+
+@worker.task(bind=True, name="update_feeds")
+def update_feeds(self, feeds: List[dict]):
+    """Feed Parser - Update a Batch of Feeds concurrently.
+
+    Steps:
+        - Fetch, parse and update every feed of the batch concurrently
+          over the shared connection pool of the worker process.
+        - Open the circuit of each feed that failed.
+
+    Retry: No, failed feeds are probed again by the scheduler once their
+    circuit has been open for long enough.
+
+    Back-off: Yes, circuits stay open exponentially longer with every
+    consecutive failure.
+
+    Drop: No.
+
+    """
+    results = run_async(process_feeds)(feeds)
+    for feed, result in zip(feeds, results):
+        if isinstance(result, Exception):
+            logging.error(
+                "failed to update feed %s in batch: %s", feed["feed_id"], str(result)
+            )
+            run_async(record_feed_failure)(feed["feed_id"], result)
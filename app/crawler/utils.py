@@ -1,28 +1,27 @@
-from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from sqlalchemy import Row
 
 from app import crud
+from app.crawler.watermark import newest_guids
 from app.db.session import get_session
-from app.schemas.feeds import FeedSchema, UpdateFeedSchema
+from app.schemas.feeds import UpdateFeedSchema
 from app.schemas.items import CreateItemSchema, ItemSchema, UpdateItemSchema
 
 
-def parse_datetime_string(datetime_str):
-    try:
-        return datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %Z").replace(
-            tzinfo=None
-        )
-    except ValueError:
-        return datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z").replace(
-            tzinfo=None
-        )
-
-
-async def fetch_feed() -> List[FeedSchema]:
+async def claim_feeds(limit: int) -> List[dict]:
     async with get_session() as session:
-        feeds = await crud.feeds.get_update_enabled_feeds(session)
-        feeds = [FeedSchema.from_orm(feed) for feed in feeds]
-        return feeds
+        feeds = await crud.feeds.claim_due_feeds(session, limit)
+        return [
+            {
+                "feed_id": feed.id,
+                "url": feed.url,
+                "modified_at": feed.modified_at,
+                "etag": feed.etag,
+                "content_hash": feed.content_hash,
+            }
+            for feed in feeds
+        ]
 
 
 async def update_feed_in_db(feed_id: int, new_feed: UpdateFeedSchema) -> None:
@@ -30,14 +29,29 @@ async def update_feed_in_db(feed_id: int, new_feed: UpdateFeedSchema) -> None:
         await crud.feeds.update_feed(session, feed_id, new_feed)
 
 
-async def pause_feed_update(feed_id: int) -> None:
+async def count_feed_fetch(feed_id: int, not_modified: bool) -> None:
     async with get_session() as session:
-        await crud.feeds.pause_update(session, feed_id)
+        await crud.feeds.count_fetch(session, feed_id, not_modified)
 
 
-async def get_item_from_db(item_guid: str) -> Optional[ItemSchema]:
+async def reschedule_feed(feed_id: int, has_new_items: bool) -> None:
     async with get_session() as session:
-        item = await crud.items.get_item_by_guid(session, item_guid)
+        await crud.feeds.reschedule(session, feed_id, has_new_items)
+
+
+async def defer_feed(feed_id: int, seconds: float) -> None:
+    async with get_session() as session:
+        await crud.feeds.defer(session, feed_id, seconds)
+
+
+async def record_feed_failure(feed_id: int, exc: BaseException) -> None:
+    async with get_session() as session:
+        await crud.feeds.record_failure(session, feed_id, type(exc).__name__)
+
+
+async def get_item_from_db(feed_id: int, item_guid: str) -> Optional[ItemSchema]:
+    async with get_session() as session:
+        item = await crud.items.get_item_by_guid(session, feed_id, item_guid)
         if item:
             return ItemSchema.from_orm(item)
         return None
@@ -51,3 +65,36 @@ async def update_item_in_db(item_id: int, new_item: UpdateItemSchema) -> None:
 async def create_item_in_db(new_item: CreateItemSchema) -> None:
     async with get_session() as session:
         await crud.items.create_item(session, new_item)
+
+
+async def get_feed_watermark(feed_id: int) -> Optional[Row]:
+    async with get_session() as session:
+        return await crud.feeds.get_watermark(session, feed_id)
+
+
+async def upsert_items_in_db(
+    feed_id: int,
+    new_items: List[CreateItemSchema],
+    reconciled: bool = False,
+    validators: Optional[dict] = None,
+) -> Dict[str, int]:
+    async with get_session() as session:
+        result = await crud.items.upsert_items(session, new_items)
+        published_at = max(
+            (item.published_at for item in new_items if item.published_at),
+            default=None,
+        )
+        await crud.feeds.advance_watermark(
+            session, feed_id, newest_guids(new_items), published_at, reconciled
+        )
+        if validators:
+            await crud.feeds.update_feed(
+                session, feed_id, UpdateFeedSchema(**validators)
+            )
+        await crud.feeds.reschedule(session, feed_id, result["inserted"] > 0)
+        return result
+
+
+async def reconcile_unread_counts_in_db() -> int:
+    async with get_session() as session:
+        return await crud.subscription.reconcile_unread_counts(session)
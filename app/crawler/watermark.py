@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from typing import Any, List, Mapping, Sequence
+
+from app.crawler.dates import parse_feed_datetime
+
+
+def new_entries(
+    entries: Sequence[Mapping[str, Any]], watermark: Any
+) -> List[Mapping[str, Any]]:
+    """
+    Return the entries of a feed past the high-water mark of ingested ones.
+
+    Entries whose guid is one of the recent guids of the watermark, or which
+    were published before its newest publication date, are left out. Every
+    entry is looked at, so new entries are found whatever the order of the
+    feed, pinned entries included. Older entries edited since are caught by
+    the periodic full reconciliation.
+
+    A publication date of the watermark in the future is ignored, so an entry
+    once dated in the future by mistake does not hide the entries after it.
+    """
+    known_guids = set(watermark.guids)
+    published_after = watermark.published_at
+    if published_after is not None and published_after > _utcnow():
+        published_after = None
+    selected = []
+    for entry in entries:
+        if entry.get("id") in known_guids:
+            continue
+        if published_after is not None:
+            published_at = parse_feed_datetime(
+                entry.get("published"), entry.get("published_parsed")
+            )
+            if published_at is not None and published_at < published_after:
+                continue
+        selected.append(entry)
+    return selected
+
+
+def newest_guids(items: Sequence[Any]) -> List[str]:
+    """
+    Return the guids of ingested items, newest first.
+
+    Items are ordered by publication date whatever the order of the feed, so
+    the guids the watermark keeps are those of the most recent entries. Items
+    without a date keep their order in the document, after the others.
+    """
+    ordered = sorted(
+        items, key=lambda item: item.published_at or datetime.min, reverse=True
+    )
+    return [item.guid for item in ordered]
+
+
+def _utcnow() -> datetime:
+    # publication dates are parsed as naive UTC datetimes
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,6 +1,19 @@
+import asyncio
+import functools
+from typing import Optional
+
 from celery import Celery
+from celery.signals import (
+    celeryd_after_setup,
+    worker_process_init,
+    worker_process_shutdown,
+)
 
+from app.core.cache import close_redis
 from app.core.config import settings
+from app.crawler.fetcher import close_fetcher
+from app.crawler.sharding import route_task, shard_queue, worker_shards
+from app.db.session import dispose_engine, init_engine
 
 worker = Celery(
     "app.crawler",
@@ -8,10 +21,74 @@ worker = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
 )
 
+# feed fetches go to one queue per shard of publisher hosts, so the feeds of
+# a host are always fetched by the same workers
+worker.conf.task_routes = (route_task,)
+
+# crawler messages are compact binary and compressed, JSON is still accepted
+# for messages queued before the switch
+worker.conf.task_serializer = "msgpack"
+worker.conf.task_compression = "zlib"
+worker.conf.accept_content = ["msgpack", "json"]
+# tasks are fire and forget, nobody reads their results
+worker.conf.task_ignore_result = True
+
 worker.autodiscover_tasks(
     packages=[
+        "app.crawler.ingest_feed_items",
+        "app.crawler.reconcile_unread_counts",
         "app.crawler.schedule_update_feed",
         "app.crawler.update_feed",
         "app.crawler.update_feed_item",
+        "app.crawler.update_feeds",
     ]
 )
+
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop shared by every task of this worker process.
+
+    Pooled database connections are bound to the loop they were opened on,
+    so tasks must not spin up a fresh loop per call.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+
+def run_async(func):
+    """
+    Run a coroutine function to completion on the worker event loop.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return get_event_loop().run_until_complete(func(*args, **kwargs))
+
+    return wrapper
+
+
+@celeryd_after_setup.connect
+def subscribe_to_shards(sender, instance, **kwargs):
+    for shard in worker_shards():
+        instance.app.amqp.queues.select_add(shard_queue(shard))
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    get_event_loop()
+    init_engine()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    loop = get_event_loop()
+    loop.run_until_complete(close_fetcher())
+    loop.run_until_complete(close_redis())
+    loop.run_until_complete(dispose_engine())
+    loop.close()
@@ -1,16 +1,30 @@
-from .feeds import get_feed, get_feed_by_url, get_update_enabled_feeds
+from .feeds import (
+    get_feed,
+    get_feed_by_url,
+    get_feed_cached,
+    get_update_enabled_feeds,
+)
 from .items import (
     create_item,
     get_item,
     get_item_by_guid,
+    get_item_cached,
     get_items_by_feed,
     update_item,
+    upsert_items,
+)
+from .read_status import update_item_read_status, update_items_read_status
+from .subscription import (
+    add_unread_count,
+    get_subscribed_feed_ids,
+    get_subscription_by_user_and_feed,
+    reconcile_unread_counts,
+    unsubscribe,
 )
-from .read_status import update_item_read_status
-from .subscription import get_subscription_by_user_and_feed, unsubscribe
 from .users import (
     authenticate,
     create_user,
+    get_cached_user,
     get_user,
     get_user_by_email,
     get_users,
@@ -1,11 +1,35 @@
+from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import (
+    Integer,
+    Interval,
+    Row,
+    Text,
+    cast,
+    func,
+    literal_column,
+    or_,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import RedisCache, read_through
+from app.core.config import settings
+from app.core.hashing import fingerprint
 from app.models import Feed, Subscription
-from app.schemas import CreateFeedSchema, UpdateFeedSchema
+from app.schemas import CreateFeedSchema, FeedSchema, UpdateFeedSchema
+
+FINGERPRINT_FIELDS = ("title", "description", "last_built_at")
+feed_cache = RedisCache("feed")
+# only the columns of the response are selected by list queries
+FEED_SCHEMA_COLUMNS = [
+    getattr(Feed, field) for field in FeedSchema.__fields__ if field != "unread_count"
+]
 
 
 async def create_feed(session: AsyncSession, feed: CreateFeedSchema) -> Feed:
@@ -26,6 +50,9 @@ async def get_feed(
     return result.scalar_one_or_none()
 
 
+get_feed_cached = read_through(feed_cache, FeedSchema)(get_feed)
+
+
 async def get_feed_by_user(session: AsyncSession, user_id: int) -> List[Optional[Feed]]:
     query = (
         select(Feed)
@@ -37,6 +64,49 @@ async def get_feed_by_user(session: AsyncSession, user_id: int) -> List[Optional
     return feeds_in_db.scalars().all()
 
 
+async def get_feeds_with_unread_count(
+    session: AsyncSession, user_id: int
+) -> List[Row]:
+    """
+    Return the feeds subscribed by the user with the number of unread items.
+
+    Feeds are plain rows with the columns of FeedSchema rather than ORM
+    entities, ready to be serialized as they are.
+    """
+    query = (
+        select(*FEED_SCHEMA_COLUMNS, Subscription.unread_count)
+        .select_from(Feed)
+        .join(Subscription)
+        .where(Subscription.user_id == user_id, Subscription.is_active)
+    )
+
+    result = await session.execute(query)
+    return result.all()
+
+
+async def get_feeds_version(session: AsyncSession, user_id: int) -> Optional[str]:
+    """
+    Return a digest of the feeds subscribed by the user, without loading them.
+
+    The digest is computed by the database over the columns returned by
+    get_feeds_with_unread_count, so it changes whenever they would.
+    """
+    row = cast(tuple_(*FEED_SCHEMA_COLUMNS, Subscription.unread_count), Text)
+    query = (
+        select(
+            func.md5(
+                func.string_agg(row, aggregate_order_by(literal_column("','"), Feed.id))
+            )
+        )
+        .select_from(Feed)
+        .join(Subscription)
+        .where(Subscription.user_id == user_id, Subscription.is_active)
+    )
+
+    result = await session.execute(query)
+    return result.scalar_one()
+
+
 async def get_feed_by_url(session: AsyncSession, url: str) -> Optional[Feed]:
     query = select(Feed).where(Feed.url == url)
     result = await session.execute(query)
@@ -55,6 +125,200 @@ async def get_update_enabled_feeds(session: AsyncSession) -> List[Feed]:
     return result.scalars().all()
 
 
+async def claim_due_feeds(session: AsyncSession, limit: int) -> List[Row]:
+    """
+    Return up to limit enabled feeds whose next fetch is due and lease them.
+
+    Feeds with an open circuit are skipped. Once the circuit has been open
+    for its back-off, the feed is claimed again as a single half-open probe.
+
+    The next fetch of every returned feed is pushed back by the fetch lease,
+    so feeds still queued or being fetched are not scheduled twice. The
+    lease is replaced by the learned interval once the fetch is done.
+
+    Only the columns needed to fetch a feed are returned. The most overdue
+    feeds come first and rows locked by a concurrent claim are skipped, so
+    callers can claim chunk after chunk until fewer than limit are returned.
+    """
+    lease = func.now() + _seconds(settings.FEED_FETCH_LEASE_SECONDS)
+    due_feeds = (
+        select(Feed.id)
+        .where(
+            Feed.is_update_enabled,
+            or_(Feed.next_fetch_at.is_(None), Feed.next_fetch_at <= func.now()),
+            or_(
+                Feed.circuit_open_until.is_(None),
+                Feed.circuit_open_until <= func.now(),
+            ),
+        )
+        .order_by(Feed.next_fetch_at.asc().nulls_first())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    query = (
+        update(Feed)
+        .where(Feed.id.in_(due_feeds.scalar_subquery()))
+        .values({Feed.next_fetch_at: lease, Feed.updated_at: Feed.updated_at})
+        .returning(
+            Feed.id, Feed.url, Feed.modified_at, Feed.etag, Feed.content_hash
+        )
+    )
+    result = await session.execute(query)
+    feeds = result.all()
+    await session.commit()
+    return feeds
+
+
+async def reschedule(session: AsyncSession, feed_id: int, has_new_items: bool) -> None:
+    """
+    Adapt the polling interval of a feed and schedule its next fetch.
+
+    The interval shrinks when the last fetch brought new items and backs off
+    exponentially while the feed stays unchanged, within the configured
+    bounds. A fetch that got this far succeeded, so the circuit is closed.
+    """
+    factor = (
+        settings.FEED_INTERVAL_SPEEDUP_FACTOR
+        if has_new_items
+        else settings.FEED_INTERVAL_BACKOFF_FACTOR
+    )
+    current = func.coalesce(
+        Feed.fetch_interval_seconds, settings.FEED_MIN_INTERVAL_SECONDS
+    )
+    interval = func.least(
+        func.greatest(current * factor, settings.FEED_MIN_INTERVAL_SECONDS),
+        settings.FEED_MAX_INTERVAL_SECONDS,
+    ).cast(Integer)
+    query = (
+        update(Feed)
+        .where(Feed.id == feed_id)
+        .values(
+            {
+                Feed.fetch_interval_seconds: interval,
+                Feed.next_fetch_at: func.now() + _seconds(interval),
+                Feed.failure_count: 0,
+                Feed.last_error: None,
+                Feed.circuit_open_until: None,
+                Feed.updated_at: Feed.updated_at,
+            }
+        )
+    )
+    await session.execute(query)
+    await session.commit()
+
+
+async def record_failure(session: AsyncSession, feed_id: int, error: str) -> None:
+    """
+    Open the circuit of a feed whose fetch failed.
+
+    The circuit stays open for a back-off growing exponentially with the
+    consecutive failures, within the configured bounds. The scheduler
+    leaves the feed alone meanwhile and probes it once the back-off is over.
+    """
+    backoff = func.least(
+        settings.FEED_CIRCUIT_BASE_SECONDS
+        * func.power(settings.FEED_CIRCUIT_BACKOFF_FACTOR, Feed.failure_count),
+        settings.FEED_CIRCUIT_MAX_SECONDS,
+    )
+    open_until = func.now() + _seconds(backoff)
+    query = (
+        update(Feed)
+        .where(Feed.id == feed_id)
+        .values(
+            {
+                Feed.failure_count: Feed.failure_count + 1,
+                Feed.last_error: error,
+                Feed.circuit_open_until: open_until,
+                Feed.next_fetch_at: open_until,
+                Feed.updated_at: Feed.updated_at,
+            }
+        )
+    )
+    await session.execute(query)
+    await session.commit()
+
+
+async def defer(session: AsyncSession, feed_id: int, seconds: float) -> None:
+    """
+    Push the next fetch of a feed back, after its host asked us to wait.
+
+    The polling interval is left as it is: the feed did not change, we just
+    could not look.
+    """
+    query = (
+        update(Feed)
+        .where(Feed.id == feed_id)
+        .values(
+            {
+                Feed.next_fetch_at: func.now() + _seconds(seconds),
+                Feed.updated_at: Feed.updated_at,
+            }
+        )
+    )
+    await session.execute(query)
+    await session.commit()
+
+
+async def get_watermark(session: AsyncSession, feed_id: int) -> Optional[Row]:
+    """
+    Return the high-water mark of the entries ingested for a feed.
+
+    The row holds the newest publication date (published_at) and the guids
+    of the newest entries (guids) ingested, and whether a full
+    reconciliation of the entries is due (reconcile_due).
+    """
+    reconcile_due = or_(
+        Feed.reconciled_at.is_(None),
+        Feed.reconciled_at
+        <= func.now() - _seconds(settings.FEED_RECONCILE_INTERVAL_SECONDS),
+    )
+    query = select(
+        Feed.watermark_published_at.label("published_at"),
+        Feed.watermark_guids.label("guids"),
+        reconcile_due.label("reconcile_due"),
+    ).where(Feed.id == feed_id)
+    result = await session.execute(query)
+    return result.first()
+
+
+async def advance_watermark(
+    session: AsyncSession,
+    feed_id: int,
+    guids: List[str],
+    published_at: Optional[datetime],
+    reconciled: bool = False,
+) -> None:
+    """
+    Move the high-water mark of a feed past newly ingested entries.
+
+    guids are the guids of the entries, newest first; they go in front of
+    the known ones, FEED_WATERMARK_GUIDS at most being kept.
+    """
+    query = select(Feed.watermark_guids).where(Feed.id == feed_id).with_for_update()
+    known_guids = (await session.execute(query)).scalar_one_or_none()
+    if known_guids is None:
+        return
+    values = {
+        Feed.watermark_guids: list(dict.fromkeys(guids + known_guids))[
+            : settings.FEED_WATERMARK_GUIDS
+        ],
+        Feed.updated_at: Feed.updated_at,
+    }
+    if published_at is not None:
+        # a date in the future, a publisher bug, would hide every new entry
+        values[Feed.watermark_published_at] = func.greatest(
+            Feed.watermark_published_at, func.least(published_at, func.now())
+        )
+    if reconciled:
+        values[Feed.reconciled_at] = func.now()
+    await session.execute(update(Feed).where(Feed.id == feed_id).values(values))
+    await session.commit()
+
+
+def _seconds(value):
+    return value * literal_column("interval '1 second'", type_=Interval)
+
+
 async def update_feed(
     session: AsyncSession, feed_id: int, feed_update: UpdateFeedSchema
 ) -> Optional[Feed]:
@@ -62,9 +326,37 @@ async def update_feed(
     if not db_feed:
         return None
     update_data = feed_update.dict(exclude_unset=True)
+    new_fingerprint = fingerprint(
+        *(
+            update_data.get(field, getattr(db_feed, field))
+            for field in FINGERPRINT_FIELDS
+        )
+    )
+    if new_fingerprint == db_feed.fingerprint:
+        # the feed itself is unchanged, only store changed fetch validators
+        # (ETag, Last-Modified, body hash) and keep updated_at as it is
+        update_data = {
+            field: value
+            for field, value in update_data.items()
+            if getattr(db_feed, field) != value
+        }
+        if not update_data:
+            return db_feed
+        query = (
+            update(Feed)
+            .where(Feed.id == feed_id)
+            .values(**update_data, updated_at=Feed.updated_at)
+        )
+        await session.execute(query)
+        await session.commit()
+        await feed_cache.invalidate(feed_id)
+        return db_feed
+
     for field, value in update_data.items():
         setattr(db_feed, field, value)
+    db_feed.fingerprint = new_fingerprint
     await session.commit()
+    await feed_cache.invalidate(feed_id)
     await session.refresh(db_feed)
     return db_feed
 
@@ -73,23 +365,26 @@ async def enable_update(session: AsyncSession, feed_id: int) -> Optional[Feed]:
     db_feed = await get_feed(session, feed_id)
     if not db_feed:
         return None
-    if db_feed.is_update_enabled:
+    if db_feed.is_update_enabled and db_feed.circuit_open_until is None:
         return db_feed
 
     db_feed.is_update_enabled = True
+    db_feed.failure_count = 0
+    db_feed.last_error = None
+    db_feed.circuit_open_until = None
     await session.commit()
+    await feed_cache.invalidate(feed_id)
     await session.refresh(db_feed)
     return db_feed
 
 
-async def pause_update(session: AsyncSession, feed_id: int) -> Optional[Feed]:
-    db_feed = await get_feed(session, feed_id)
-    if not db_feed:
-        return None
-    if not db_feed.is_update_enabled:
-        return db_feed
-
-    db_feed.is_update_enabled = False
+async def count_fetch(session: AsyncSession, feed_id: int, not_modified: bool) -> None:
+    counter = Feed.not_modified_count if not_modified else Feed.fetched_count
+    query = (
+        update(Feed)
+        .where(Feed.id == feed_id)
+        # bookkeeping only, the feed content itself did not change
+        .values({counter: counter + 1, Feed.updated_at: Feed.updated_at})
+    )
+    await session.execute(query)
     await session.commit()
-    await session.refresh(db_feed)
-    return db_feed
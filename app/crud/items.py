@@ -1,19 +1,47 @@
 import logging
-from typing import List, Optional
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, String, cast, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.functions import coalesce
 
+from app.core.cache import RedisCache, read_through
+from app.core.config import settings
+from app.core.hashing import fingerprint
+from app.core.pagination import decode_cursor, encode_cursor
+from app.crud.subscription import add_unread_count
 from app.models.items import Item
 from app.models.read_status import ReadStatus
 from app.models.subscription import Subscription
-from app.schemas.items import CreateItemSchema, ItemQueryParams, UpdateItemSchema
+from app.schemas.common_query_params import CommonQueryOrderEnum
+from app.schemas.items import (
+    CreateItemSchema,
+    ItemExportQueryParams,
+    ItemQueryParams,
+    ItemQueryReadStatusEnum,
+    ItemSchema,
+    UpdateItemSchema,
+)
+
+
+item_cache = RedisCache("item")
+# only the columns of the response are selected by list queries
+ITEM_SCHEMA_COLUMNS = [getattr(Item, field) for field in ItemSchema.__fields__]
+
+
+def item_fingerprint(title, url, description) -> str:
+    return fingerprint(title, url, description)
 
 
 async def create_item(session: AsyncSession, item: CreateItemSchema) -> Item:
-    db_item = Item(**item.dict())
+    db_item = Item(
+        **item.dict(),
+        fingerprint=item_fingerprint(item.title, item.url, item.description),
+    )
     session.add(db_item)
+    await add_unread_count(session, item.feed_id, 1)
     await session.commit()
     await session.refresh(db_item)
     return db_item
@@ -25,53 +53,154 @@ async def get_item(session: AsyncSession, item_id: int) -> Optional[Item]:
     return result.scalar_one_or_none()
 
 
-async def get_items(
-    session: AsyncSession, user_id: int, query_params: ItemQueryParams
-) -> Optional[Item]:
-    if query_params.feed_id:
-        subscribed_feed_stmt = (
-            select(Subscription.feed_id)
+def _subscribed_items_query(
+    user_id: int,
+    feed_id: Optional[int] = None,
+    status: Optional[ItemQueryReadStatusEnum] = None,
+):
+    subscribed_feed_stmt = select(Subscription.feed_id).where(
+        Subscription.user_id == user_id, Subscription.is_active
+    )
+    if feed_id:
+        subscribed_feed_stmt = subscribed_feed_stmt.where(
+            Subscription.feed_id == feed_id
+        )
+
+    query = select(*ITEM_SCHEMA_COLUMNS).where(
+        Item.feed_id.in_(subscribed_feed_stmt)
+    )
+
+    if status:
+        is_read = (
+            select(ReadStatus.id)
             .where(
-                Subscription.user_id == user_id,
-                Subscription.is_active,
-                Subscription.feed_id == query_params.feed_id,
+                ReadStatus.item_id == Item.id,
+                ReadStatus.user_id == user_id,
+                ReadStatus.is_read,
             )
-            .subquery()
-        )
-    else:
-        subscribed_feed_stmt = (
-            select(Subscription.feed_id)
-            .where(Subscription.user_id == user_id, Subscription.is_active)
-            .subquery()
+            .exists()
         )
+        if status == "read":
+            query = query.where(is_read)
+
+        if status == "unread":
+            query = query.where(~is_read)
+
+    return query
+
+
+def _order_items(query, order: Optional[CommonQueryOrderEnum]):
+    if order == "asc":
+        return query.order_by(Item.updated_at.asc(), Item.id.asc())
+    return query.order_by(Item.updated_at.desc(), Item.id.desc())
+
+
+get_item_cached = read_through(item_cache, ItemSchema)(get_item)
+
+
+async def get_items(
+    session: AsyncSession, user_id: int, query_params: ItemQueryParams
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Return a page of items of the feeds subscribed by the user.
+
+    Items are plain rows with the columns of ItemSchema rather than ORM
+    entities, ready to be serialized as they are. Pages are keyset paginated
+    on (updated_at, id): the cursor of the next page is returned along with
+    the items, or None on the last page.
+
+    Raises ValueError if the cursor of the query is malformed.
+    """
+    query = _subscribed_items_query(
+        user_id, query_params.feed_id, query_params.status
+    )
+
+    sort_key = tuple_(Item.updated_at, Item.id)
+    if query_params.cursor:
+        cursor = decode_cursor(query_params.cursor)
+        if query_params.order == "asc":
+            query = query.where(sort_key > tuple_(*cursor))
+        else:
+            query = query.where(sort_key < tuple_(*cursor))
 
-    query = select(Item).where(Item.feed_id == subscribed_feed_stmt.c.feed_id)
+    query = _order_items(query, query_params.order)
+    # one extra row tells whether there is a next page
+    query = query.limit(query_params.limit + 1)
+
+    result = await session.execute(query)
+    items = result.all()
+    if len(items) <= query_params.limit:
+        return items, None
+
+    items = items[: query_params.limit]
+    return items, encode_cursor(items[-1].updated_at, items[-1].id)
+
+
+async def get_items_version(
+    session: AsyncSession, user_id: int, query_params: ItemQueryParams
+) -> Tuple:
+    """
+    Return a summary of the items visible to the user, without loading them.
+
+    The summary changes whenever a page of items of the query could change:
+    an item is added, updated or removed, the subscribed feeds change or,
+    when filtering on read status, a read status changes.
+    """
+    subscribed_feed_stmt = select(Subscription.feed_id).where(
+        Subscription.user_id == user_id, Subscription.is_active
+    )
+    feed_ids = select(
+        func.string_agg(
+            cast(Subscription.feed_id, String),
+            aggregate_order_by(literal_column("','"), Subscription.feed_id),
+        )
+    ).where(Subscription.user_id == user_id, Subscription.is_active)
+    query = select(
+        feed_ids.scalar_subquery(), func.count(Item.id), func.max(Item.updated_at)
+    ).where(Item.feed_id.in_(subscribed_feed_stmt))
 
     if query_params.status:
-        read_item_stmt = (
-            select(ReadStatus.item_id).where(ReadStatus.user_id == user_id, ReadStatus.is_read)
+        read_status = select(ReadStatus).where(ReadStatus.user_id == user_id)
+        query = query.add_columns(
+            read_status.with_only_columns(func.count(ReadStatus.id)).scalar_subquery(),
+            read_status.with_only_columns(
+                func.max(ReadStatus.updated_at)
+            ).scalar_subquery(),
         )
-        sub_read_item_stmt = read_item_stmt.subquery()
-        if query_params.status == 'read':
-            query = query.filter(Item.id == sub_read_item_stmt.c.item_id)
 
-        if query_params.status == 'unread':
-            result = await session.execute(read_item_stmt)
-            read_items = result.scalars().all()
-            if len(read_items):
-                query = query.filter(Item.id != sub_read_item_stmt.c.item_id)
+    result = await session.execute(query)
+    return tuple(result.one())
+
 
-    if query_params.order == "asc":
-        query = query.order_by(Item.updated_at.asc())
-    else:
-        query = query.order_by(Item.updated_at.desc())
+async def stream_items(
+    session: AsyncSession, user_id: int, query_params: ItemExportQueryParams
+) -> AsyncIterator[List[Row]]:
+    """
+    Yield every item of the feeds subscribed by the user, in chunks.
 
-    result = await session.execute(query)
-    return result.scalars().all()
+    Rows are read through a server-side cursor, EXPORT_FETCH_SIZE at a time,
+    so memory use does not depend on the number of items.
+    """
+    query = _subscribed_items_query(
+        user_id, query_params.feed_id, query_params.status
+    )
+    query = _order_items(query, query_params.order).execution_options(
+        yield_per=settings.EXPORT_FETCH_SIZE
+    )
 
+    result = await session.stream(query)
+    try:
+        async for rows in result.partitions():
+            yield rows
+    finally:
+        # release the cursor even if the consumer stops early
+        await result.close()
 
-async def get_item_by_guid(session: AsyncSession, guid: str) -> Optional[Item]:
-    query = select(Item).where(Item.guid == guid)
+
+async def get_item_by_guid(
+    session: AsyncSession, feed_id: int, guid: str
+) -> Optional[Item]:
+    query = select(Item).where(Item.feed_id == feed_id, Item.guid == guid)
     result = await session.execute(query)
     return result.scalar_one_or_none()
 
@@ -82,20 +211,93 @@ async def update_item(
     db_item = await get_item(session=session, item_id=item_id)
     if not db_item:
         return None
-    for field, value in item:
-        if value:
-            setattr(db_item, field, value)
+    update_data = {field: value for field, value in item if value}
+    new_fingerprint = item_fingerprint(
+        update_data.get("title", db_item.title),
+        update_data.get("url", db_item.url),
+        update_data.get("description", db_item.description),
+    )
+    if new_fingerprint == db_item.fingerprint:
+        return db_item
+
+    for field, value in update_data.items():
+        setattr(db_item, field, value)
+    db_item.fingerprint = new_fingerprint
     await session.commit()
+    await item_cache.invalidate(item_id)
     await session.refresh(db_item)
     return db_item
 
 
+async def upsert_items(
+    session: AsyncSession, items: List[CreateItemSchema]
+) -> Dict[str, int]:
+    """
+    Insert or update a batch of items with a single statement.
+
+    Rows are matched on (feed_id, guid); an existing row is only rewritten
+    when the fingerprint of its title, url and description differs from the
+    one of the incoming entry.
+
+    Returns the number of inserted, updated and unchanged items.
+    """
+    # Postgres refuses to touch the same row twice in one statement,
+    # so duplicated entries of a feed are collapsed (last one wins).
+    rows = list(
+        {
+            (item.feed_id, item.guid): {
+                **item.dict(),
+                "fingerprint": item_fingerprint(
+                    item.title, item.url, item.description
+                ),
+            }
+            for item in items
+        }.values()
+    )
+    if not rows:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    insert_stmt = insert(Item).values(rows)
+    excluded = insert_stmt.excluded
+    upsert_stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[Item.feed_id, Item.guid],
+        set_={
+            "title": excluded.title,
+            "url": excluded.url,
+            "description": excluded.description,
+            "fingerprint": excluded.fingerprint,
+            "updated_at": func.now(),
+        },
+        where=Item.fingerprint.is_distinct_from(excluded.fingerprint),
+    ).returning(
+        Item.id, Item.feed_id, literal_column("xmax = 0").label("inserted")
+    )
+
+    result = await session.execute(upsert_stmt)
+    written = result.all()
+
+    inserted_per_feed = Counter(row.feed_id for row in written if row.inserted)
+    for feed_id, count in inserted_per_feed.items():
+        await add_unread_count(session, feed_id, count)
+    await session.commit()
+    await item_cache.invalidate(*(row.id for row in written if not row.inserted))
+
+    inserted = sum(inserted_per_feed.values())
+    updated = len(written) - inserted
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(rows) - inserted - updated,
+    }
+
+
 async def delete_item(session: AsyncSession, item_id: int) -> Optional[Item]:
     db_item = await get_item(session=session, item_id=item_id)
     if not db_item:
         return None
-    session.delete(db_item)
+    await session.delete(db_item)
     await session.commit()
+    await item_cache.invalidate(item_id)
     return db_item
 
 
@@ -1,9 +1,14 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
+from sqlalchemy import func, literal, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.models.items import Item
 from app.models.read_status import ReadStatus
+from app.models.subscription import Subscription
 
 
 async def create_read_status(
@@ -28,13 +33,93 @@ async def get_item_read_status(
 
 async def update_item_read_status(
     session: AsyncSession, item_id: int, user_id: int, is_read: bool
-) -> Optional[ReadStatus]:
-    db_item_read_status = await get_item_read_status(session, item_id, user_id)
-    if not db_item_read_status:
-        new_status = await create_read_status(session, item_id, user_id, is_read)
-        return new_status
+) -> bool:
+    """
+    Mark an item as read or unread.
+
+    Returns whether the read status of the item changed.
+    """
+    updated = await update_items_read_status(
+        session, user_id, is_read, item_ids=[item_id]
+    )
+    return updated > 0
+
 
-    db_item_read_status.is_read = is_read
+async def update_items_read_status(
+    session: AsyncSession,
+    user_id: int,
+    is_read: bool,
+    item_ids: Optional[List[int]] = None,
+    feed_id: Optional[int] = None,
+    until: Optional[datetime] = None,
+) -> int:
+    """
+    Mark many items of the feeds subscribed by the user as read or unread.
+
+    Items can be narrowed down by id, by feed and to the ones updated at or
+    before a timestamp; without any of these every subscribed item matches.
+    The whole change is a single statement: an "INSERT ... SELECT ... ON
+    CONFLICT DO UPDATE" to mark as read, an UPDATE to mark as unread (an item
+    without read status is unread already), and the unread counters of the
+    affected subscriptions are adjusted by the same statement.
+
+    Returns the number of items whose read status changed.
+    """
+    subscribed_feed_stmt = select(Subscription.feed_id).where(
+        Subscription.user_id == user_id, Subscription.is_active
+    )
+    conditions = [Item.feed_id.in_(subscribed_feed_stmt)]
+    if item_ids is not None:
+        conditions.append(Item.id.in_(item_ids))
+    if feed_id is not None:
+        conditions.append(Item.feed_id == feed_id)
+    if until is not None:
+        conditions.append(Item.updated_at <= until)
+
+    if is_read:
+        items_stmt = select(literal(user_id), Item.id, literal(True)).where(
+            *conditions
+        )
+        insert_stmt = insert(ReadStatus).from_select(
+            ["user_id", "item_id", "is_read"], items_stmt
+        )
+        change_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[ReadStatus.user_id, ReadStatus.item_id],
+            set_={"is_read": insert_stmt.excluded.is_read, "updated_at": func.now()},
+            where=ReadStatus.is_read.isnot(True),
+        )
+        unread_delta = -1
+    else:
+        change_stmt = (
+            update(ReadStatus)
+            .where(
+                ReadStatus.user_id == user_id,
+                ReadStatus.is_read,
+                ReadStatus.item_id.in_(select(Item.id).where(*conditions)),
+            )
+            .values(is_read=False)
+        )
+        unread_delta = 1
+
+    changed = change_stmt.returning(ReadStatus.item_id).cte("changed")
+    deltas = (
+        select(Item.feed_id, (func.count() * unread_delta).label("delta"))
+        .join(changed, Item.id == changed.c.item_id)
+        .group_by(Item.feed_id)
+        .subquery()
+    )
+    counters = (
+        update(Subscription)
+        .where(
+            Subscription.user_id == user_id,
+            Subscription.feed_id == deltas.c.feed_id,
+        )
+        .values(unread_count=Subscription.unread_count + deltas.c.delta)
+        .returning(Subscription.id)
+        .cte("counters")
+    )
+    query = select(func.count()).select_from(changed).add_cte(counters)
+
+    result = await session.execute(query)
     await session.commit()
-    await session.refresh(db_item_read_status)
-    return db_item_read_status
+    return result.scalar_one()
@@ -1,9 +1,29 @@
-from typing import Optional
+from typing import FrozenSet, Optional
 
+from sqlalchemy import exists, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.models import Subscription
+from app.core.cache import TTLCache
+from app.models import Item, ReadStatus, Subscription
+
+subscribed_feeds_cache = TTLCache("subscribed_feeds")
+
+
+def unread_count_query(user_id, feed_id):
+    """
+    Scalar subquery counting the items of a feed not read by a user.
+    """
+    is_read = exists().where(
+        ReadStatus.item_id == Item.id,
+        ReadStatus.user_id == user_id,
+        ReadStatus.is_read,
+    )
+    return (
+        select(func.count(Item.id))
+        .where(Item.feed_id == feed_id, ~is_read)
+        .scalar_subquery()
+    )
 
 
 async def get_subscription(
@@ -24,6 +44,23 @@ async def get_subscription_by_user_and_feed(
     return result.scalar_one_or_none()
 
 
+async def get_subscribed_feed_ids(
+    session: AsyncSession, user_id: int
+) -> FrozenSet[int]:
+    """
+    Return the ids of the feeds actively subscribed by the user, cached.
+    """
+    feed_ids = subscribed_feeds_cache.get(user_id)
+    if feed_ids is None:
+        statement = select(Subscription.feed_id).where(
+            Subscription.user_id == user_id, Subscription.is_active
+        )
+        result = await session.execute(statement)
+        feed_ids = frozenset(result.scalars().all())
+        subscribed_feeds_cache.set(user_id, feed_ids)
+    return feed_ids
+
+
 async def resubscribe(
     session: AsyncSession, subscription_id: int
 ) -> Optional[Subscription]:
@@ -34,7 +71,12 @@ async def resubscribe(
         return db_subscription
 
     setattr(db_subscription, "is_active", True)
+    # counters are not maintained while unsubscribed
+    db_subscription.unread_count = unread_count_query(
+        db_subscription.user_id, db_subscription.feed_id
+    )
     await session.commit()
+    await subscribed_feeds_cache.invalidate(db_subscription.user_id)
     await session.refresh(db_subscription)
     return db_subscription
 
@@ -47,12 +89,18 @@ async def create_subscription(
     )
     if existing_subscription:
         if not existing_subscription.is_active:
-            await resubscribe(existing_subscription.id)
+            await resubscribe(session, existing_subscription.id)
         return existing_subscription
 
-    db_subscription = Subscription(is_active=True, user_id=user_id, feed_id=feed_id)
+    db_subscription = Subscription(
+        is_active=True,
+        user_id=user_id,
+        feed_id=feed_id,
+        unread_count=unread_count_query(user_id, feed_id),
+    )
     session.add(db_subscription)
     await session.commit()
+    await subscribed_feeds_cache.invalidate(user_id)
     await session.refresh(db_subscription)
     return db_subscription
 
@@ -67,6 +115,41 @@ async def unsubscribe(
         if existing_subscription.is_active:
             setattr(existing_subscription, "is_active", False)
             await session.commit()
+            await subscribed_feeds_cache.invalidate(user_id)
             await session.refresh(existing_subscription)
 
         return existing_subscription
+
+
+async def add_unread_count(session: AsyncSession, feed_id: int, count: int) -> None:
+    """
+    Count new items of a feed as unread for all of its active subscriptions.
+
+    The caller commits, so the counters change with the items themselves.
+    """
+    if not count:
+        return
+    query = (
+        update(Subscription)
+        .where(Subscription.feed_id == feed_id, Subscription.is_active)
+        .values(unread_count=Subscription.unread_count + count)
+    )
+    await session.execute(query)
+
+
+async def reconcile_unread_counts(session: AsyncSession) -> int:
+    """
+    Recount the unread items of every active subscription and repair drift.
+
+    Returns the number of repaired subscriptions.
+    """
+    actual = unread_count_query(Subscription.user_id, Subscription.feed_id)
+    query = (
+        update(Subscription)
+        .where(Subscription.is_active, Subscription.unread_count != actual)
+        .values(unread_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(query)
+    await session.commit()
+    return result.rowcount
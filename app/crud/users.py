@@ -3,12 +3,18 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.cache import TTLCache
+from app.core.security import hash_password, verify_password
 from app.models import User as DBUser
 from app.schemas import CreateUserSchema, UpdateUserSchema
 
+user_cache = TTLCache("user")
+
 
 async def create_user(session: AsyncSession, user: CreateUserSchema) -> DBUser:
-    db_user = DBUser(**user.dict())
+    user_data = user.dict()
+    user_data["hashed_password"] = await hash_password(user_data.pop("password"))
+    db_user = DBUser(**user_data)
     session.add(db_user)
     await session.commit()
     await session.refresh(db_user)
@@ -20,6 +26,22 @@ async def get_user(session: AsyncSession, user_id: int) -> Optional[DBUser]:
     return result.scalar_one_or_none()
 
 
+async def get_cached_user(session: AsyncSession, user_id: int) -> Optional[DBUser]:
+    """
+    Return the user from the cache, loading it from the database on a miss.
+
+    The returned user is detached from any session, so it must only be read.
+    """
+    db_user = user_cache.get(user_id)
+    if db_user is None:
+        db_user = await get_user(session, user_id)
+        if db_user is not None:
+            # keep later loads of this session from sharing the cached copy
+            session.expunge(db_user)
+            user_cache.set(user_id, db_user)
+    return db_user
+
+
 async def get_user_by_email(session: AsyncSession, email: str) -> Optional[DBUser]:
     result = await session.execute(select(DBUser).filter_by(email=email))
     return result.scalar_one_or_none()
@@ -39,9 +61,13 @@ async def update_user(
     if not db_user:
         return None
     update_data = user.dict(exclude_unset=True)
+    password = update_data.pop("password", None)
+    if password is not None:
+        update_data["hashed_password"] = await hash_password(password)
     for field, value in update_data.items():
         setattr(db_user, field, value)
     await session.commit()
+    await user_cache.invalidate(user_id)
     await session.refresh(db_user)
     return db_user
 
@@ -52,6 +78,11 @@ async def authenticate(
     db_user = await get_user_by_email(session, email)
     if not db_user:
         return None
-    if not db_user.verify_password(password):
+    is_valid, new_hash = await verify_password(password, db_user.hashed_password)
+    if not is_valid:
         return None
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await session.commit()
+        await user_cache.invalidate(db_user.id)
     return db_user
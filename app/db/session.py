@@ -1,31 +1,88 @@
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
 
+engine: Optional[AsyncEngine] = None
+async_session: Optional[async_sessionmaker] = None
 
-def async_session_generator():
-    engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI, echo=True)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+def init_engine() -> AsyncEngine:
+    """
+    Create the process-wide engine and session factory.
+
+    The engine owns the connection pool, so it must be created once per
+    process (in the FastAPI lifespan or in the Celery worker process) and
+    shared by every session opened afterwards.
+    """
+    global engine, async_session
+    if engine is None:
+        engine = create_async_engine(
+            settings.SQLALCHEMY_DATABASE_URI,
+            echo=settings.DB_ECHO,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+        async_session = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+    return engine
+
+
+async def dispose_engine() -> None:
+    """
+    Close every pooled connection and drop the process-wide engine.
+    """
+    global engine, async_session
+    if engine is not None:
+        await engine.dispose()
+    engine = None
+    async_session = None
+
+
+def get_pool_status() -> dict:
+    """
+    Return connection pool statistics of the process-wide engine.
+    """
+    if engine is None:
+        return {"initialized": False}
+    pool = engine.pool
+    return {
+        "initialized": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+def async_session_generator() -> async_sessionmaker:
+    init_engine()
     return async_session
 
 
 async def get_async_session():
-    async_session = async_session_generator()
-    async with async_session() as session:
+    async_session_factory = async_session_generator()
+    async with async_session_factory() as session:
         yield session
 
 
 @asynccontextmanager
 async def get_session():
-    try:
-        async_session = async_session_generator()
-        async with async_session() as session:
+    async_session_factory = async_session_generator()
+    async with async_session_factory() as session:
+        try:
             yield session
-    except Exception:
-        await session.rollback()
-        raise
-    finally:
-        await session.close()
+        except Exception:
+            await session.rollback()
+            raise
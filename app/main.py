@@ -1,8 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.health import router as health_api_router
 from app.api.v1.routers import api_router
+from app.core.cache import start_cache_invalidation, stop_cache_invalidation
 from app.core.config import settings
+from app.db.session import dispose_engine, init_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_engine()
+    await start_cache_invalidation()
+    yield
+    await stop_cache_invalidation()
+    await dispose_engine()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -10,6 +24,7 @@ app = FastAPI(
     version="0.1.0",
     contact={"name": "Mohammad Mohiuddin", "email": "opummjopu@gmail.com"},
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Boolean, Column, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -19,7 +20,24 @@ class Feed(Base):
     description = Column(String)
     last_built_at = Column(DateTime, default=None)
     modified_at = Column(String)
+    etag = Column(String)
+    content_hash = Column(String)
+    fingerprint = Column(String)
+    fetched_count = Column(Integer, nullable=False, default=0, server_default="0")
+    not_modified_count = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     is_update_enabled = Column(Boolean, default=True)
+    fetch_interval_seconds = Column(Integer)
+    next_fetch_at = Column(DateTime, default=None, index=True)
+    failure_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(String)
+    circuit_open_until = Column(DateTime, default=None)
+    watermark_published_at = Column(DateTime, default=None)
+    watermark_guids = Column(
+        ARRAY(String), nullable=False, default=list, server_default="{}"
+    )
+    reconciled_at = Column(DateTime, default=None)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(
         DateTime, nullable=False, default=func.now(), onupdate=func.now()
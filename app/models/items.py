@@ -1,6 +1,15 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -16,9 +25,10 @@ class Item(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     url = Column(String, nullable=False, index=True)
-    guid = Column(String, nullable=False, index=True)
+    guid = Column(String, nullable=False)
     description = Column(String, default=None)
     published_at = Column(DateTime)
+    fingerprint = Column(String)
     feed_id = Column(
         Integer, ForeignKey("feed.id", onupdate="CASCADE", ondelete="CASCADE")
     )
@@ -30,3 +40,8 @@ class Item(Base):
     read_status = relationship(
         "ReadStatus", backref="item", cascade="all, delete-orphan"
     )
+
+    __table_args__ = (
+        UniqueConstraint("feed_id", "guid", name="unique_feed_guid"),
+        Index("ix_item_feed_id_updated_at_id", "feed_id", "updated_at", "id"),
+    )
@@ -1,6 +1,14 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -15,9 +23,18 @@ class ReadStatus(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     is_read = Column(Boolean, default=False)
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
     user_id = Column(
         Integer, ForeignKey("user.id", onupdate="CASCADE", ondelete="CASCADE")
     )
     item_id = Column(
         Integer, ForeignKey("item.id", onupdate="CASCADE", ondelete="CASCADE")
     )
+
+    __table_args__ = (UniqueConstraint("user_id", "item_id", name="unique_user_item"),)
@@ -15,6 +15,7 @@ class Subscription(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     is_active = Column(Boolean, default=True)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
     user_id = Column(
         Integer, ForeignKey("user.id", onupdate="CASCADE", ondelete="CASCADE")
     )
@@ -1,17 +1,15 @@
 from typing import TYPE_CHECKING
 
-from passlib.context import CryptContext
 from sqlalchemy import Column, DateTime, Integer, String, func
 from sqlalchemy.orm import relationship
 
+from app.core.security import pwd_context
 from app.db.base_class import Base
 
 if TYPE_CHECKING:
     from .read_status import ReadStatus  # noqa: F401
     from .subscription import Subscription  # noqa: F401
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class User(Base):
     __tablename__ = "user"
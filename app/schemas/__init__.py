@@ -1,4 +1,13 @@
 from .feeds import CreateFeedSchema, FeedQueryParams, FeedSchema, UpdateFeedSchema
-from .items import CreateItemSchema, ItemQueryParams, ItemSchema, UpdateItemSchema
+from .items import (
+    CreateItemSchema,
+    ItemExportFormatEnum,
+    ItemExportQueryParams,
+    ItemQueryParams,
+    ItemSchema,
+    UpdateItemSchema,
+    UpdateReadStatusResultSchema,
+    UpdateReadStatusSchema,
+)
 from .token import TokenPayloadSchema, TokenSchema
 from .users import CreateUserSchema, UpdateUserSchema, UserSchema
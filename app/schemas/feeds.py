@@ -12,11 +12,14 @@ class CreateFeedSchema(FeedSchemaBase):
     url: HttpUrl
 
 
+# written by the crawler only, the fetch validators are not part of FeedSchema
 class UpdateFeedSchema(FeedSchemaBase):
     title: Optional[str] = None
     description: Optional[str] = None
     last_built_at: datetime = None
     modified_at: Optional[str] = None
+    etag: Optional[str] = None
+    content_hash: Optional[str] = None
 
 
 class FeedSchema(FeedSchemaBase):
@@ -25,6 +28,7 @@ class FeedSchema(FeedSchemaBase):
     description: Optional[str] = None
     last_built_at: Optional[datetime] = None
     modified_at: Optional[str] = None
+    unread_count: Optional[int] = None
     is_update_enabled: Optional[bool]
     created_at: Optional[datetime]
 
@@ -2,11 +2,15 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, conint, conlist
 
 from app.schemas.common_query_params import CommonQueryOrderEnum
 
 
+ITEMS_DEFAULT_PAGE_SIZE = 50
+ITEMS_MAX_PAGE_SIZE = 500
+
+
 class ItemSchemaBase(BaseModel):
     title: Optional[str]
     url: Optional[HttpUrl]
@@ -35,6 +39,17 @@ class UpdateItemSchema(ItemSchemaBase):
     description: Optional[str] = None
 
 
+class UpdateReadStatusSchema(BaseModel):
+    mark_as_read: bool = True
+    item_ids: Optional[conlist(int, min_items=1, max_items=ITEMS_MAX_PAGE_SIZE)]
+    feed_id: Optional[int]
+    until: Optional[datetime]
+
+
+class UpdateReadStatusResultSchema(BaseModel):
+    updated: int
+
+
 class ItemQuerySortEnum(str, Enum):
     updated_at = "updated_at"
 
@@ -49,9 +64,23 @@ class ItemQueryParams(BaseModel):
     status: Optional[ItemQueryReadStatusEnum]
     sort: Optional[ItemQuerySortEnum] = ItemQuerySortEnum.updated_at
     order: Optional[CommonQueryOrderEnum] = CommonQueryOrderEnum.desc
+    limit: conint(ge=1, le=ITEMS_MAX_PAGE_SIZE) = ITEMS_DEFAULT_PAGE_SIZE
+    cursor: Optional[str]
 
     class Config:
         fields = {
             "order": {"exclude": True},
             "sort": {"exclude": True},
         }
+
+
+class ItemExportFormatEnum(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ItemExportQueryParams(BaseModel):
+    feed_id: Optional[int]
+    status: Optional[ItemQueryReadStatusEnum]
+    order: Optional[CommonQueryOrderEnum] = CommonQueryOrderEnum.desc
+    format: ItemExportFormatEnum = ItemExportFormatEnum.ndjson
@@ -4,7 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from app.main import app
-from app.schemas.feeds import CreateFeedSchema
+from app.schemas.feeds import CreateFeedSchema, UpdateFeedSchema
+from app.schemas.items import CreateItemSchema
 from app import crud
 
 url = "https://www.example.com/feed"
@@ -63,6 +64,51 @@ async def test_get_feeds(client: AsyncClient, default_user_headers):
     assert response_data[0]["url"] == url
 
 
+@pytest.mark.asyncio
+async def test_get_feeds_unread_count(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    # create feed
+    response = await client.post(
+        app.url_path_for("create_feed"), json=feed.dict(), headers=default_user_headers
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    await crud.items.upsert_items(
+        session,
+        [
+            CreateItemSchema(
+                title=f"Dummy Title {index}",
+                url=f"https://www.dummyurl.com/{index}",
+                guid=f"dummy_guid_{index}",
+                feed_id=feed_id,
+                published_at="2023-05-01 19:06:27.000000",
+            )
+            for index in range(3)
+        ],
+    )
+    items = await crud.items.get_items_by_feed(session, feed_id)
+
+    # mark one item as read, twice to check it is only counted once
+    for _ in range(2):
+        response = await client.post(
+            app.url_path_for("update_item", item_id=items[0].id),
+            params="mark_as_read=true",
+            headers=default_user_headers,
+        )
+        assert response.status_code == 200
+
+    response = await client.get(
+        app.url_path_for("get_feeds"), headers=default_user_headers
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["unread_count"] == 2
+
+    # the maintained counter agrees with a full recount
+    assert await crud.subscription.reconcile_unread_counts(session) == 0
+
+
 @pytest.mark.asyncio
 async def test_get_feed_by_id(
     client: AsyncClient, default_user_headers, session: AsyncSession
@@ -173,3 +219,53 @@ async def test_get_subscribed_feeds(
     # Check that we are getting only subscribed feed.
     response_data = response.json()
     assert len(response_data) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_feeds_not_modified(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    response = await client.post(
+        app.url_path_for("create_feed"), json=feed.dict(), headers=default_user_headers
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    response = await client.get(
+        app.url_path_for("get_feeds"), headers=default_user_headers
+    )
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        app.url_path_for("get_feeds"),
+        headers={**default_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # crawler bookkeeping is not part of the list
+    await crud.feeds.count_fetch(session, feed_id, not_modified=True)
+    await crud.feeds.update_feed(
+        session, feed_id, UpdateFeedSchema(etag='"v2"', content_hash="hash")
+    )
+    response = await client.get(
+        app.url_path_for("get_feeds"),
+        headers={**default_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    # a new subscription changes the list
+    response = await client.post(
+        app.url_path_for("create_feed"),
+        json=CreateFeedSchema(url="https://www.example.com/other").dict(),
+        headers=default_user_headers,
+    )
+    assert response.status_code == 201
+
+    response = await client.get(
+        app.url_path_for("get_feeds"),
+        headers={**default_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -1,3 +1,7 @@
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -115,3 +119,315 @@ async def test_mark_as_read(
     )
     assert response.status_code == 200
     assert len(response_data) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_items_pagination(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    # create feed
+    url = "https://www.example.com/feed"
+    feed_data = CreateFeedSchema(url=url)
+
+    response = await client.post(
+        app.url_path_for("create_feed"),
+        json=feed_data.dict(),
+        headers=default_user_headers,
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    for index in range(5):
+        await crud.items.create_item(
+            session,
+            CreateItemSchema(
+                title=f"Dummy Title {index}",
+                url=f"https://www.dummyurl.com/{index}",
+                guid=f"dummy_guid_{index}",
+                feed_id=feed_id,
+                published_at="2023-05-01 19:06:27.000000",
+            ),
+        )
+
+    # walk through all pages
+    guids = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(
+            app.url_path_for("get_items"), params=params, headers=default_user_headers
+        )
+        assert response.status_code == 200
+        response_data = response.json()
+        assert len(response_data) <= 2
+        guids.extend(item["guid"] for item in response_data)
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    assert guids == [f"dummy_guid_{index}" for index in reversed(range(5))]
+
+    # malformed cursor
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params={"cursor": "not-a-cursor"},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 400
+
+    # page size out of bounds
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params={"limit": 0},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_filter_read_status(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    # create feed
+    url = "https://www.example.com/feed"
+    feed_data = CreateFeedSchema(url=url)
+
+    response = await client.post(
+        app.url_path_for("create_feed"),
+        json=feed_data.dict(),
+        headers=default_user_headers,
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    db_items = [
+        await crud.items.create_item(
+            session,
+            CreateItemSchema(
+                title=f"Dummy Title {index}",
+                url=f"https://www.dummyurl.com/{index}",
+                guid=f"dummy_guid_{index}",
+                feed_id=feed_id,
+                published_at="2023-05-01 19:06:27.000000",
+            ),
+        )
+        for index in range(2)
+    ]
+
+    # mark only the first item as read
+    response = await client.post(
+        app.url_path_for("update_item", item_id=db_items[0].id),
+        params="mark_as_read=true",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=unread",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [db_items[1].id]
+
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=read",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [db_items[0].id]
+
+
+@pytest.mark.asyncio
+async def test_update_items_read_status(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    # create feed
+    url = "https://www.example.com/feed"
+    feed_data = CreateFeedSchema(url=url)
+
+    response = await client.post(
+        app.url_path_for("create_feed"),
+        json=feed_data.dict(),
+        headers=default_user_headers,
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    db_items = [
+        await crud.items.create_item(
+            session,
+            CreateItemSchema(
+                title=f"Dummy Title {index}",
+                url=f"https://www.dummyurl.com/{index}",
+                guid=f"dummy_guid_{index}",
+                feed_id=feed_id,
+                published_at="2023-05-01 19:06:27.000000",
+            ),
+        )
+        for index in range(3)
+    ]
+
+    # mark a list of items as read
+    response = await client.post(
+        app.url_path_for("update_items_read_status"),
+        json={"item_ids": [db_items[0].id, db_items[1].id]},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+
+    # mark the whole feed as read, only the remaining item changes
+    response = await client.post(
+        app.url_path_for("update_items_read_status"),
+        json={"feed_id": feed_id},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 1}
+
+    # mark everything as unread again
+    response = await client.post(
+        app.url_path_for("update_items_read_status"),
+        json={"mark_as_read": False},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 3}
+
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=unread",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_items(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    # create feed
+    url = "https://www.example.com/feed"
+    feed_data = CreateFeedSchema(url=url)
+
+    response = await client.post(
+        app.url_path_for("create_feed"),
+        json=feed_data.dict(),
+        headers=default_user_headers,
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    db_items = [
+        await crud.items.create_item(
+            session,
+            CreateItemSchema(
+                title=f"Dummy Title {index}",
+                url=f"https://www.dummyurl.com/{index}",
+                guid=f"dummy_guid_{index}",
+                feed_id=feed_id,
+                published_at="2023-05-01 19:06:27.000000",
+            ),
+        )
+        for index in range(3)
+    ]
+
+    response = await client.get(
+        app.url_path_for("export_items"),
+        params={"order": "asc"},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        item.id for item in db_items
+    ]
+
+    # filters are the same as for the list of items
+    response = await client.post(
+        app.url_path_for("update_item", item_id=db_items[0].id),
+        params="mark_as_read=true",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        app.url_path_for("export_items"),
+        params={"status": "unread", "format": "csv", "order": "asc"},
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [item.id for item in db_items[1:]]
+
+
+@pytest.mark.asyncio
+async def test_get_items_not_modified(
+    client: AsyncClient, default_user_headers, session: AsyncSession
+):
+    # create feed
+    url = "https://www.example.com/feed"
+    feed_data = CreateFeedSchema(url=url)
+
+    response = await client.post(
+        app.url_path_for("create_feed"),
+        json=feed_data.dict(),
+        headers=default_user_headers,
+    )
+    assert response.status_code == 201
+    feed_id = response.json()["id"]
+
+    db_item = await crud.items.create_item(
+        session,
+        CreateItemSchema(
+            title="Dummy Title",
+            url="https://www.dummyurl.com",
+            guid="dummy_guid",
+            feed_id=feed_id,
+            published_at="2023-05-01 19:06:27.000000",
+        ),
+    )
+
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=unread",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=unread",
+        headers={**default_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    # other query parameters have their own ETag
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=unread&order=asc",
+        headers={**default_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+
+    # reading the item changes the unread items
+    response = await client.post(
+        app.url_path_for("update_item", item_id=db_item.id),
+        params="mark_as_read=true",
+        headers=default_user_headers,
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        app.url_path_for("get_items"),
+        params="status=unread",
+        headers={**default_user_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 404
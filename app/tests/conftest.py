@@ -8,6 +8,7 @@ from httpx import AsyncClient
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.cache import clear_caches
 from app.core.config import settings
 from app.core.security import create_access_token
 from app.main import app
@@ -54,6 +55,7 @@ async def session(test_db_setup_sessionmaker) -> AsyncGenerator[AsyncSession, No
         for name, table in Base.metadata.tables.items():
             await session.execute(delete(table))
         await session.commit()
+        clear_caches()
 
 
 @pytest_asyncio.fixture(scope="session")
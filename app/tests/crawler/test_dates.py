@@ -0,0 +1,39 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from app.crawler.dates import parse_feed_datetime
+
+utc_date = datetime(2023, 5, 1, 19, 6, 27)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Mon, 01 May 2023 19:06:27 GMT",
+        "Mon, 01 May 2023 21:06:27 +0200",
+        "Mon, 1 May 23 15:06:27 EDT",
+        "01 May 2023 19:06:27 Z",
+        "Monday, 01-May-2023 19:06:27 UT",
+        "Mon, 01 May 2023 21:06:27 +0200 (CEST)",
+        "2023-05-01T19:06:27Z",
+        "2023-05-01T21:06:27.123+02:00",
+        "2023-05-01 19:06:27",
+    ],
+)
+def test_parse_feed_datetime(value):
+    assert parse_feed_datetime(value) == utc_date
+
+
+@pytest.mark.parametrize(
+    "value", [None, "", "yesterday", "Tue, 31 Feb 2023 10:00:00 GMT"]
+)
+def test_parse_feed_datetime_invalid(value):
+    assert parse_feed_datetime(value) is None
+
+
+def test_parse_feed_datetime_uses_parsed_date():
+    parsed = time.strptime("2023-05-01 19:06:27", "%Y-%m-%d %H:%M:%S")
+    assert parse_feed_datetime("unparsable", parsed) == utc_date
+    assert parse_feed_datetime("unparsable", list(parsed[:6])) == utc_date
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from app.crawler.fetcher import FeedFetcher
+
+
+@pytest.mark.asyncio
+async def test_host_slots_are_dropped_when_idle():
+    fetcher = FeedFetcher(max_connections_per_host=1)
+    second_entered = asyncio.Event()
+
+    async def second():
+        async with fetcher._host_slot("a.example.com"):
+            second_entered.set()
+
+    async with fetcher._host_slot("a.example.com"):
+        task = asyncio.create_task(second())
+        await asyncio.sleep(0)
+        # the second request waits for the slot of the host
+        assert not second_entered.is_set()
+        assert fetcher._host_requests == {"a.example.com": 2}
+    await task
+
+    assert second_entered.is_set()
+    assert fetcher._host_semaphores == {}
+    assert fetcher._host_requests == {}
@@ -0,0 +1,43 @@
+import feedparser
+from kombu import serialization
+
+from app.crawler.payloads import compact_entries
+from app.crawler.worker import worker
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item>
+  <title>Title</title>
+  <link>https://www.example.com/items/1</link>
+  <guid>https://www.example.com/items/1</guid>
+  <description>Description</description>
+  <category>News</category>
+  <pubDate>Mon, 01 May 2023 19:06:27 GMT</pubDate>
+</item>
+<item><title>No link</title></item>
+</channel></rss>"""
+
+
+def test_compact_entries_round_trip():
+    entries = compact_entries(feedparser.parse(FEED).entries)
+
+    assert entries == [
+        {
+            "id": "https://www.example.com/items/1",
+            "title": "Title",
+            "link": "https://www.example.com/items/1",
+            "summary": "Description",
+            "published": "Mon, 01 May 2023 19:06:27 GMT",
+            "published_parsed": [2023, 5, 1, 19, 6, 27],
+        },
+        # missing fields stay missing, so the loader skips the entry
+        {"title": "No link"},
+    ]
+
+    content_type, content_encoding, body = serialization.dumps(
+        [1, entries], serializer=worker.conf.task_serializer
+    )
+    accept = serialization.prepare_accept_content(worker.conf.accept_content)
+    assert serialization.loads(
+        body, content_type, content_encoding, accept=accept
+    ) == [1, entries]
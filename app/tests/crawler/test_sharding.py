@@ -0,0 +1,33 @@
+from app.crawler.sharding import route_task, shard_for_url, shard_queue
+
+urls = [f"https://host-{index}.example.com/feed" for index in range(1000)]
+
+
+def test_shard_for_url_groups_hosts():
+    assert shard_for_url("https://www.example.com/a", 8) == shard_for_url(
+        "http://WWW.example.com/b?c=d", 8
+    )
+    assert {shard_for_url(url, 8) for url in urls} == set(range(8))
+
+
+def test_adding_a_shard_moves_few_hosts():
+    before = [shard_for_url(url, 4) for url in urls]
+    after = [shard_for_url(url, 5) for url in urls]
+
+    moved = [new for old, new in zip(before, after) if old != new]
+    # only the share of the new shard moves, and only to the new shard
+    assert set(moved) == {4}
+    assert 100 < len(moved) < 300
+
+
+def test_route_task():
+    url = "https://www.example.com/feed"
+    queue = shard_queue(shard_for_url(url))
+
+    assert route_task("update_feed", [], {"feed_id": 1, "url": url}, {}) == {
+        "queue": queue
+    }
+    assert route_task("update_feeds", [[{"feed_id": 1, "url": url}]], {}, {}) == {
+        "queue": queue
+    }
+    assert route_task("ingest_feed_items", [1, []], {}, {}) is None
@@ -0,0 +1,176 @@
+import feedparser
+import pytest
+
+from app.crawler.streaming import FeedDocumentError, parse_feed
+
+RSS_2 = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+  <title>Feed</title>
+  <description>Description</description>
+  <lastBuildDate>Mon, 01 May 2023 19:06:27 GMT</lastBuildDate>
+  <image><title>Logo</title></image>
+  <item>
+    <title>First</title>
+    <link>https://www.example.com/items/1</link>
+    <guid>https://www.example.com/items/1</guid>
+    <description><![CDATA[<p>Hello</p><script>alert(1)</script>]]></description>
+    <pubDate>Mon, 01 May 2023 19:06:27 GMT</pubDate>
+  </item>
+  <item>
+    <title>Second</title>
+    <link>https://www.example.com/items/2</link>
+    <guid>https://www.example.com/items/2</guid>
+    <content:encoded><![CDATA[<p>Content</p>]]></content:encoded>
+    <pubDate>Mon, 01 May 2023 18:06:27 GMT</pubDate>
+  </item>
+</channel>
+</rss>"""
+
+RSS_1 = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+  xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://www.example.com/">
+    <title>Feed</title>
+    <description>Description</description>
+  </channel>
+  <item rdf:about="https://www.example.com/items/1">
+    <title>First</title>
+    <link>https://www.example.com/items/1</link>
+    <description>Hello</description>
+    <dc:date>2023-05-01T19:06:27Z</dc:date>
+  </item>
+</rdf:RDF>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Feed</title>
+  <subtitle>Description</subtitle>
+  <updated>2023-05-01T19:06:27Z</updated>
+  <entry>
+    <title>First</title>
+    <link rel="self" href="https://www.example.com/items/1.atom"/>
+    <link rel="alternate" href="https://www.example.com/items/1"/>
+    <id>urn:uuid:1</id>
+    <content type="xhtml">
+      <div xmlns="http://www.w3.org/1999/xhtml"><p>Hello</p></div>
+    </content>
+    <published>2023-05-01T19:06:27Z</published>
+  </entry>
+</feed>"""
+
+EMPTY = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+  <title/>
+  <description></description>
+  <item>
+    <title>First</title>
+    <link>https://www.example.com/items/1</link>
+    <guid>https://www.example.com/items/1</guid>
+    <description></description>
+    <content:encoded><![CDATA[<p>Content</p>]]></content:encoded>
+    <pubDate/>
+  </item>
+</channel>
+</rss>"""
+
+
+def test_parse_rss_2():
+    feed = parse_feed(RSS_2, chunk_size=16)
+
+    assert feed.feed == {
+        "title": "Feed",
+        "description": "Description",
+        "updated": "Mon, 01 May 2023 19:06:27 GMT",
+    }
+    assert feed.entries == [
+        {
+            "id": "https://www.example.com/items/1",
+            "title": "First",
+            "link": "https://www.example.com/items/1",
+            "summary": "<p>Hello</p>",
+            "published": "Mon, 01 May 2023 19:06:27 GMT",
+        },
+        {
+            "id": "https://www.example.com/items/2",
+            "title": "Second",
+            "link": "https://www.example.com/items/2",
+            "summary": "<p>Content</p>",
+            "published": "Mon, 01 May 2023 18:06:27 GMT",
+        },
+    ]
+
+
+def test_parse_rss_1():
+    feed = parse_feed(RSS_1)
+
+    assert feed.feed.title == "Feed"
+    assert feed.entries == [
+        {
+            "id": "https://www.example.com/items/1",
+            "title": "First",
+            "link": "https://www.example.com/items/1",
+            "summary": "Hello",
+            "published": "2023-05-01T19:06:27Z",
+        }
+    ]
+
+
+def test_parse_atom():
+    feed = parse_feed(ATOM)
+
+    assert feed.feed.description == "Description"
+    assert feed.entries == [
+        {
+            "id": "urn:uuid:1",
+            "title": "First",
+            "link": "https://www.example.com/items/1",
+            "summary": "<p>Hello</p>",
+            "published": "2023-05-01T19:06:27Z",
+        }
+    ]
+
+
+def test_parse_empty_elements():
+    feed = parse_feed(EMPTY)
+    expected = feedparser.parse(EMPTY)
+
+    assert feed.feed == {"title": "", "description": ""}
+    assert feed.entries == [
+        {
+            "id": "https://www.example.com/items/1",
+            "title": "First",
+            "link": "https://www.example.com/items/1",
+            "summary": "",
+            "published": "",
+        }
+    ]
+    for field, value in feed.feed.items():
+        assert expected.feed[field] == value
+    for field, value in feed.entries[0].items():
+        assert expected.entries[0][field] == value
+
+
+def test_parse_sanitizes_summary():
+    content = RSS_2.replace(
+        b"<p>Hello</p>",
+        b'<p onclick="alert(1)">Hello<iframe src="https://www.example.com/"></iframe>'
+        b'<a href="javascript:alert(1)">link</a></p>',
+    )
+    feed = parse_feed(content)
+    assert feed.entries[0]["summary"] == '<p>Hello<a href="">link</a></p>'
+
+
+def test_parse_stops_early():
+    # the document is cut after the first item, which is never noticed
+    feed = parse_feed(RSS_2[: RSS_2.index(b"<title>Second")], max_entries=1)
+    assert [entry["title"] for entry in feed.entries] == ["First"]
+
+
+@pytest.mark.parametrize(
+    "content", [b"<html><body></body></html>", b"<rss><channel>", b"not xml"]
+)
+def test_parse_invalid_document(content):
+    with pytest.raises(FeedDocumentError):
+        parse_feed(content)
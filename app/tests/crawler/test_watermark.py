@@ -0,0 +1,53 @@
+from collections import namedtuple
+from datetime import datetime
+
+from app.crawler.watermark import new_entries, newest_guids
+
+Watermark = namedtuple("Watermark", ["published_at", "guids"])
+Item = namedtuple("Item", ["guid", "published_at"])
+
+entries = [
+    {"id": "3", "published": "Mon, 01 May 2023 21:00:00 GMT"},
+    {"id": "2", "published": "Mon, 01 May 2023 20:00:00 GMT"},
+    {"id": "1", "published": "Mon, 01 May 2023 19:00:00 GMT"},
+]
+
+
+def test_new_entries_skip_known_guids():
+    watermark = Watermark(None, ["2", "1"])
+    assert new_entries(entries, watermark) == entries[:1]
+
+
+def test_new_entries_skip_older_entries():
+    watermark = Watermark(datetime(2023, 5, 1, 20, 30), [])
+    assert new_entries(entries, watermark) == entries[:1]
+
+
+def test_new_entries_without_watermark():
+    assert new_entries(entries, Watermark(None, [])) == entries
+
+
+def test_new_entries_oldest_first():
+    watermark = Watermark(datetime(2023, 5, 1, 20), ["2", "1"])
+    assert new_entries(entries[::-1], watermark) == entries[:1]
+
+
+def test_new_entries_with_pinned_entry():
+    pinned = {"id": "pinned", "published": "Sun, 01 Jan 2023 00:00:00 GMT"}
+    watermark = Watermark(datetime(2023, 5, 1, 20), ["pinned", "2", "1"])
+    assert new_entries([pinned] + entries, watermark) == entries[:1]
+
+
+def test_new_entries_ignore_future_watermark():
+    watermark = Watermark(datetime(2999, 1, 1), ["3"])
+    assert new_entries(entries, watermark) == entries[1:]
+
+
+def test_newest_guids():
+    items = [
+        Item("1", datetime(2023, 5, 1, 19)),
+        Item("undated", None),
+        Item("3", datetime(2023, 5, 1, 21)),
+        Item("2", datetime(2023, 5, 1, 20)),
+    ]
+    assert newest_guids(items) == ["3", "2", "1", "undated"]
@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.schemas.feeds import CreateFeedSchema, UpdateFeedSchema
+
+
+@pytest.mark.asyncio
+async def test_claim_due_feeds(session: AsyncSession):
+    db_feeds = [
+        await crud.feeds.create_feed(
+            session, CreateFeedSchema(url=f"https://www.example.com/feed/{index}")
+        )
+        for index in range(3)
+    ]
+
+    # new feeds are due immediately, claimed chunk by chunk and leased
+    first = await crud.feeds.claim_due_feeds(session, limit=2)
+    second = await crud.feeds.claim_due_feeds(session, limit=2)
+    assert len(first) == 2
+    assert sorted(feed.id for feed in first + second) == [
+        feed.id for feed in db_feeds
+    ]
+    assert await crud.feeds.claim_due_feeds(session, limit=2) == []
+
+
+@pytest.mark.asyncio
+async def test_reschedule(session: AsyncSession):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+
+    await crud.feeds.reschedule(session, db_feed.id, has_new_items=False)
+    await session.refresh(db_feed)
+    assert db_feed.fetch_interval_seconds == settings.FEED_MIN_INTERVAL_SECONDS * 2
+    assert db_feed.next_fetch_at is not None
+
+    await crud.feeds.reschedule(session, db_feed.id, has_new_items=True)
+    await session.refresh(db_feed)
+    assert db_feed.fetch_interval_seconds == settings.FEED_MIN_INTERVAL_SECONDS
+
+    # the interval never grows past the ceiling
+    for _ in range(20):
+        await crud.feeds.reschedule(session, db_feed.id, has_new_items=False)
+    await session.refresh(db_feed)
+    assert db_feed.fetch_interval_seconds == settings.FEED_MAX_INTERVAL_SECONDS
+
+    # rescheduled in the future, so it is not due
+    assert await crud.feeds.claim_due_feeds(session, limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_update_feed_skips_unchanged(session: AsyncSession):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+    feed_update = UpdateFeedSchema(
+        title="Title",
+        description="Description",
+        last_built_at=datetime(2023, 5, 1, 19, 6, 27),
+        etag='"v1"',
+    )
+    db_feed = await crud.feeds.update_feed(session, db_feed.id, feed_update)
+    updated_at = db_feed.updated_at
+
+    # same content with a new ETag only stores the ETag
+    feed_update.etag = '"v2"'
+    await crud.feeds.update_feed(session, db_feed.id, feed_update)
+    await session.refresh(db_feed)
+    assert db_feed.etag == '"v2"'
+    assert db_feed.updated_at == updated_at
+
+    feed_update.title = "New title"
+    await crud.feeds.update_feed(session, db_feed.id, feed_update)
+    await session.refresh(db_feed)
+    assert db_feed.title == "New title"
+    assert db_feed.updated_at > updated_at
+
+
+@pytest.mark.asyncio
+async def test_record_failure(session: AsyncSession):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+
+    await crud.feeds.record_failure(session, db_feed.id, "ClientConnectorError")
+    await session.refresh(db_feed)
+    first_open_until = db_feed.circuit_open_until
+    assert db_feed.failure_count == 1
+    assert db_feed.last_error == "ClientConnectorError"
+    assert db_feed.next_fetch_at == first_open_until
+
+    # the circuit is open, so the feed is not claimed
+    assert await crud.feeds.claim_due_feeds(session, limit=10) == []
+
+    await crud.feeds.record_failure(session, db_feed.id, "TimeoutError")
+    await session.refresh(db_feed)
+    assert db_feed.failure_count == 2
+    # the back-off doubled
+    backoff = (db_feed.circuit_open_until - first_open_until).total_seconds()
+    assert settings.FEED_CIRCUIT_BASE_SECONDS <= backoff < (
+        settings.FEED_CIRCUIT_BASE_SECONDS + 5
+    )
+
+    # a successful fetch closes the circuit
+    await crud.feeds.reschedule(session, db_feed.id, has_new_items=True)
+    await session.refresh(db_feed)
+    assert db_feed.failure_count == 0
+    assert db_feed.last_error is None
+    assert db_feed.circuit_open_until is None
+
+
+@pytest.mark.asyncio
+async def test_watermark(session: AsyncSession):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+
+    watermark = await crud.feeds.get_watermark(session, db_feed.id)
+    assert watermark.guids == []
+    assert watermark.published_at is None
+    assert watermark.reconcile_due
+
+    published_at = datetime(2023, 5, 1, 19, 6, 27)
+    await crud.feeds.advance_watermark(
+        session, db_feed.id, ["3", "2", "1"], published_at, reconciled=True
+    )
+    watermark = await crud.feeds.get_watermark(session, db_feed.id)
+    assert watermark.guids == ["3", "2", "1"]
+    assert watermark.published_at == published_at
+    assert not watermark.reconcile_due
+
+    # new guids come first, the oldest ones fall off the ring
+    guids = [f"new-{index}" for index in range(settings.FEED_WATERMARK_GUIDS - 2)]
+    await crud.feeds.advance_watermark(session, db_feed.id, guids, None)
+    watermark = await crud.feeds.get_watermark(session, db_feed.id)
+    assert watermark.guids == guids + ["3", "2"]
+    assert watermark.published_at == published_at
+
+    # a date in the future does not move the watermark past the current time
+    await crud.feeds.advance_watermark(
+        session, db_feed.id, ["future"], datetime(2999, 1, 1)
+    )
+    watermark = await crud.feeds.get_watermark(session, db_feed.id)
+    assert published_at < watermark.published_at <= datetime.utcnow()
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.schemas.feeds import CreateFeedSchema
+from app.schemas.items import CreateItemSchema, UpdateItemSchema
+
+
+def make_item(feed_id: int, guid: str, title: str) -> CreateItemSchema:
+    return CreateItemSchema(
+        title=title,
+        url=f"https://www.dummyurl.com/{guid}",
+        guid=guid,
+        feed_id=feed_id,
+        description="This is a dummy item.",
+        published_at="2023-05-01 19:06:27.000000",
+    )
+
+
+@pytest.mark.asyncio
+async def test_upsert_items(session: AsyncSession):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+
+    result = await crud.items.upsert_items(
+        session,
+        [
+            make_item(db_feed.id, "guid_1", "First"),
+            make_item(db_feed.id, "guid_2", "Second"),
+            make_item(db_feed.id, "guid_2", "Second"),
+        ],
+    )
+    assert result == {"inserted": 2, "updated": 0, "unchanged": 0}
+
+    result = await crud.items.upsert_items(
+        session,
+        [
+            make_item(db_feed.id, "guid_1", "First"),
+            make_item(db_feed.id, "guid_2", "Second (edited)"),
+            make_item(db_feed.id, "guid_3", "Third"),
+        ],
+    )
+    assert result == {"inserted": 1, "updated": 1, "unchanged": 1}
+
+    items = await crud.items.get_items_by_feed(session, db_feed.id)
+    assert sorted(item.title for item in items) == [
+        "First",
+        "Second (edited)",
+        "Third",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_item_skips_unchanged(session: AsyncSession):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+    db_item = await crud.items.create_item(
+        session, make_item(db_feed.id, "guid_1", "First")
+    )
+    updated_at = db_item.updated_at
+
+    await crud.items.update_item(
+        session, db_item.id, UpdateItemSchema(title="First")
+    )
+    await session.refresh(db_item)
+    assert db_item.updated_at == updated_at
+
+    await crud.items.update_item(
+        session, db_item.id, UpdateItemSchema(title="First (edited)")
+    )
+    await session.refresh(db_item)
+    assert db_item.title == "First (edited)"
+    assert db_item.updated_at > updated_at
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.schemas.feeds import CreateFeedSchema
+
+
+@pytest.mark.asyncio
+async def test_subscribed_feed_ids_cache(session: AsyncSession, default_user):
+    db_feed = await crud.feeds.create_feed(
+        session, CreateFeedSchema(url="https://www.example.com/feed")
+    )
+    assert await crud.subscription.get_subscribed_feed_ids(
+        session, default_user.id
+    ) == frozenset()
+
+    # every change of subscription drops the cached feed ids
+    await crud.subscription.create_subscription(session, db_feed.id, default_user.id)
+    assert await crud.subscription.get_subscribed_feed_ids(
+        session, default_user.id
+    ) == {db_feed.id}
+
+    await crud.subscription.unsubscribe(session, db_feed.id, default_user.id)
+    assert await crud.subscription.get_subscribed_feed_ids(
+        session, default_user.id
+    ) == frozenset()
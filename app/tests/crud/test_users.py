@@ -0,0 +1,31 @@
+import pytest
+from passlib.hash import bcrypt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.models import User
+
+
+@pytest.mark.asyncio
+async def test_authenticate_rehashes_deprecated_hash(session: AsyncSession):
+    email = "weak_hash@ff.com"
+    weak_hash = bcrypt.using(rounds=4).hash("p@ssword")
+    user = User(email=email, hashed_password=weak_hash)
+    session.add(user)
+    await session.commit()
+    user_id = user.id
+    await crud.users.get_cached_user(session, user_id)
+
+    assert await crud.authenticate(session, email, "wrong") is None
+    assert crud.users.user_cache.get(user_id) is not None
+
+    db_user = await crud.authenticate(session, email, "p@ssword")
+    assert db_user is not None
+    assert db_user.hashed_password != weak_hash
+    assert bcrypt.from_string(db_user.hashed_password).rounds == (
+        settings.PASSWORD_BCRYPT_ROUNDS
+    )
+    # the cached copy of the user, with the old hash, is dropped
+    assert crud.users.user_cache.get(user_id) is None
+    assert await crud.authenticate(session, email, "p@ssword") is not None
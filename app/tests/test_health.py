@@ -1,6 +1,7 @@
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
 from app.main import app
 
 client = TestClient(app)
@@ -11,3 +12,24 @@ def test_health_check():
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == {"status": "ok"}
+
+
+def test_db_pool_status():
+    response = client.get(app.url_path_for("db_pool_status"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "initialized" in response.json()
+
+
+def test_password_hash_status():
+    response = client.get(app.url_path_for("password_hash_status"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["max_workers"] == settings.PASSWORD_HASH_MAX_WORKERS
+
+
+def test_cache_status():
+    response = client.get(app.url_path_for("cache_status"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {"user", "feed", "item"} <= set(response.json())
@@ -0,0 +1,114 @@
+"""
+Parsing cost of the publication dates of feed entries.
+
+Compares the former parser (strptime with %Z, then with %z on ValueError)
+with parse_feed_datetime over dates as found in real-world feeds, cold
+(every string parsed) and warm (the same feed entries parsed again, served
+from the memo).
+
+Run with the application settings in the environment:
+
+    set -a; . ./.env; set +a
+    python -m benchmarks.dates
+"""
+import argparse
+import re
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from app.crawler.dates import _parse, parse_feed_datetime
+
+CORPUS = [
+    "Mon, 01 May 2023 19:06:27 GMT",
+    "Mon, 01 May 2023 19:06:27 +0000",
+    "Mon, 01 May 2023 21:06:27 +0200",
+    "Mon, 01 May 2023 15:06:27 -0400",
+    "Mon, 1 May 2023 19:06:27 GMT",
+    "Mon, 01 May 2023 15:06:27 EDT",
+    "Mon, 01 May 2023 12:06:27 PDT",
+    "01 May 2023 19:06:27 GMT",
+    "Mon, 01 May 23 19:06:27 GMT",
+    "Mon, 01 May 2023 19:06 GMT",
+    "Mon, 01 May 2023 19:06:27 UT",
+    "Mon, 01 May 2023 21:06:27 +0200 (CEST)",
+    "Monday, 01-May-2023 19:06:27 GMT",
+    "2023-05-01T19:06:27Z",
+    "2023-05-01T21:06:27+02:00",
+    "2023-05-01T19:06:27.123456Z",
+    "2023-05-01 19:06:27",
+]
+
+
+def legacy_parse(datetime_str):
+    try:
+        return datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %Z").replace(
+            tzinfo=None
+        )
+    except ValueError:
+        return datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z").replace(
+            tzinfo=None
+        )
+
+
+def build_dates(count: int) -> List[str]:
+    # distinct strings: shift minutes and seconds so every date is parsed cold
+    return [
+        re.sub(
+            r":06(:27)?",
+            lambda match: f":{index % 60:02d}"
+            + (f":{index // 60 % 60:02d}" if match.group(1) else ""),
+            CORPUS[index % len(CORPUS)],
+            count=1,
+        )
+        for index in range(count)
+    ]
+
+
+def measure(parse: Callable, dates: List[str], repeat: int, cold: bool) -> tuple:
+    best, failures = float("inf"), 0
+    for _ in range(repeat):
+        if cold:
+            _parse.cache_clear()
+        failures = 0
+        start = time.process_time()
+        for value in dates:
+            try:
+                if parse(value) is None:
+                    failures += 1
+            except ValueError:
+                failures += 1
+        best = min(best, time.process_time() - start)
+    return best, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dates", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--feed-entries", type=int, default=50)
+    args = parser.parse_args()
+
+    dates = build_dates(args.dates)
+    # the entries of a feed fetched again and again
+    repeated_dates = dates[: args.feed_entries] * (args.dates // args.feed_entries)
+    results = {
+        "strptime %Z / %z": measure(legacy_parse, dates, args.repeat, cold=True),
+        "parse_feed_datetime, cold": measure(
+            parse_feed_datetime, dates, args.repeat, cold=True
+        ),
+        "parse_feed_datetime, warm": measure(
+            parse_feed_datetime, repeated_dates, args.repeat, cold=False
+        ),
+    }
+    print(f"{args.dates} dates, best of {args.repeat} runs (CPU time)")
+    legacy_seconds = results["strptime %Z / %z"][0]
+    for name, (seconds, failures) in results.items():
+        print(
+            f"  {name:<26} {seconds * 1000:8.1f} ms"
+            f" {legacy_seconds / seconds:6.1f}x  {failures:6d} unparsed"
+        )
+
+
+if __name__ == "__main__":
+    main()
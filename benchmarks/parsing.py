@@ -0,0 +1,86 @@
+"""
+Parsing cost of a large feed, such as a podcast with thousands of episodes.
+
+Compares feedparser, which builds the whole document before returning, with
+the streaming parser reading every entry and reading only the first
+FEED_MAX_ENTRIES entries. Peak memory is traced by tracemalloc on a
+separate run.
+
+Run with the application settings in the environment:
+
+    set -a; . ./.env; set +a
+    python -m benchmarks.parsing
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+import feedparser
+
+from app.core.config import settings
+from app.crawler.streaming import parse_feed
+
+ITEM = """
+<item>
+  <title>Episode {index}</title>
+  <link>https://www.example.com/episodes/{index}</link>
+  <guid>https://www.example.com/episodes/{index}</guid>
+  <description><![CDATA[<p>{text}</p>]]></description>
+  <content:encoded><![CDATA[<p>{text}</p><p>{text}</p><p>{text}</p>]]></content:encoded>
+  <enclosure url="https://www.example.com/episodes/{index}.mp3" type="audio/mpeg"
+    length="31337"/>
+  <itunes:duration>01:02:03</itunes:duration>
+  <pubDate>Mon, 01 May 2023 19:06:27 GMT</pubDate>
+</item>
+"""
+
+
+def build_feed(count: int) -> bytes:
+    text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 10
+    items = "".join(ITEM.format(index=index, text=text) for index in range(count))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss version="2.0"'
+        ' xmlns:content="http://purl.org/rss/1.0/modules/content/"'
+        ' xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">'
+        "<channel><title>Podcast</title><description>Episodes</description>"
+        f"{items}</channel></rss>"
+    ).encode()
+
+
+def measure(parse: Callable, content: bytes) -> tuple:
+    start = time.process_time()
+    entries = len(parse(content).entries)
+    seconds = time.process_time() - start
+    # tracing slows allocations down, so memory is measured on its own run
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5_000)
+    args = parser.parse_args()
+
+    content = build_feed(args.items)
+    results = {
+        "feedparser": measure(feedparser.parse, content),
+        "streaming, every entry": measure(
+            lambda data: parse_feed(data, max_entries=args.items), content
+        ),
+        f"streaming, first {settings.FEED_MAX_ENTRIES}": measure(parse_feed, content),
+    }
+    print(f"{len(content) / 1024 / 1024:.1f} MiB feed, {args.items} items (CPU time)")
+    for name, (seconds, peak, entries) in results.items():
+        print(
+            f"  {name:<24} {seconds * 1000:8.1f} ms"
+            f" {peak / 1024 / 1024:8.1f} MiB peak  {entries:6d} entries"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Broker payload size of the entries of a fetched feed.
+
+Compares the message body of "ingest_feed_items" carrying the whole parsed
+entries as JSON with the compact entries as msgpack compressed by zlib, the
+way the crawler sends them.
+
+Run with the application settings in the environment:
+
+    set -a; . ./.env; set +a
+    python -m benchmarks.payloads
+"""
+import argparse
+import random
+
+import feedparser
+from kombu import serialization
+from kombu.compression import compress
+
+from app.crawler.payloads import compact_entries
+
+ITEM = """
+<item>
+  <title>Item title {index}</title>
+  <link>https://www.example.com/feed/items/{index}</link>
+  <guid>https://www.example.com/feed/items/{index}</guid>
+  <description>{text}</description>
+  <content:encoded><![CDATA[<p>{text}</p><p>{text}</p>]]></content:encoded>
+  <category>News</category>
+  <category>Category {category}</category>
+  <pubDate>Mon, 01 May 2023 19:06:27 GMT</pubDate>
+</item>
+"""
+
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+    "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo"
+).split()
+
+
+def build_feed(count: int) -> bytes:
+    generator = random.Random(0)
+    items = "".join(
+        ITEM.format(
+            index=index,
+            category=index % 10,
+            text=" ".join(generator.choices(WORDS, k=40)),
+        )
+        for index in range(count)
+    )
+    return (
+        '<?xml version="1.0"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>Feed</title>{items}</channel></rss>"
+    ).encode()
+
+
+def message_size(args: list, serializer: str, compression: str = None) -> int:
+    _, _, body = serialization.dumps(args, serializer=serializer)
+    if compression:
+        body, _ = compress(body, compression)
+    return len(body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+
+    entries = feedparser.parse(build_feed(args.items)).entries
+    raw_size = message_size([1, entries], "json")
+    compact_size = message_size([1, compact_entries(entries)], "msgpack", "zlib")
+    print(f"{args.items} entries, message body")
+    print(f"  parsed entries + json:          {raw_size / 1024:8.1f} KiB")
+    print(f"  compact entries + msgpack/zlib: {compact_size / 1024:8.1f} KiB")
+    print(f"  reduction:                      {raw_size / compact_size:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
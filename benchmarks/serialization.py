@@ -0,0 +1,101 @@
+"""
+Serialization cost of a page of GET /items.
+
+Compares the ORM path (entities -> ItemSchema.from_orm -> response_model
+validation -> stdlib json) with the row path (Core rows -> orjson). The
+database round trip is left out, only the CPU time of turning loaded rows
+into a response body is measured.
+
+Run with the application settings in the environment:
+
+    set -a; . ./.env; set +a
+    python -m benchmarks.serialization
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import Row
+from sqlalchemy.engine.result import SimpleResultMetaData
+
+from app.crud.items import ITEM_SCHEMA_COLUMNS
+from app.models import Item
+from app.schemas import ItemSchema
+
+
+def build_items(count: int) -> List[Item]:
+    now = datetime(2023, 5, 1, 19, 6, 27)
+    return [
+        Item(
+            id=index,
+            title=f"Item title {index}",
+            url=f"https://www.example.com/feed/items/{index}",
+            guid=f"https://www.example.com/feed/items/{index}",
+            description="Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+            * 4,
+            feed_id=index % 100,
+            published_at=now - timedelta(minutes=index),
+            updated_at=now - timedelta(seconds=index),
+        )
+        for index in range(count)
+    ]
+
+
+def build_rows(items: List[Item]) -> List[Row]:
+    metadata = SimpleResultMetaData([column.key for column in ITEM_SCHEMA_COLUMNS])
+    return [
+        Row(
+            metadata,
+            None,
+            metadata._key_to_index,
+            tuple(getattr(item, column.key) for column in ITEM_SCHEMA_COLUMNS),
+        )
+        for item in items
+    ]
+
+
+async def orm_path(items: List[Item]) -> bytes:
+    field = create_response_field(name="response", type_=List[ItemSchema])
+    content = await serialize_response(
+        field=field, response_content=[ItemSchema.from_orm(item) for item in items]
+    )
+    return JSONResponse(content).body
+
+
+async def row_path(rows: List[Row]) -> bytes:
+    return ORJSONResponse([row._asdict() for row in rows]).body
+
+
+def measure(coroutine_function, data, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        asyncio.run(coroutine_function(data))
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items = build_items(args.items)
+    rows = build_rows(items)
+
+    orm_seconds = measure(orm_path, items, args.repeat)
+    row_seconds = measure(row_path, rows, args.repeat)
+    print(f"{args.items} items, best of {args.repeat} runs (CPU time)")
+    print(f"  ORM + pydantic + json: {orm_seconds * 1000:8.1f} ms")
+    print(f"  rows + orjson:         {row_seconds * 1000:8.1f} ms")
+    print(f"  speed-up:              {orm_seconds / row_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()